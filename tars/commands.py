@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from tars.format import format_tool_result
 from tars.memory import _load_pinned, append_daily, save_correction, save_reward
@@ -205,7 +205,7 @@ def dispatch(
     parts = stripped.split()
     cmd = parts[0]
 
-    if cmd not in _ALL_COMMANDS:
+    if cmd not in _COMMANDS:
         return f"Unknown command: {cmd}. Type /help for available commands."
 
     channel = (context or {}).get("channel", "")
@@ -217,104 +217,14 @@ def dispatch(
         return f"{cmd} is only available in the CLI."
 
     try:
-        if cmd == "/todoist":
-            return _dispatch_todoist(parts, provider, model)
-        if cmd == "/weather":
-            return _run_tool("weather_now", {})
-        if cmd == "/forecast":
-            return _run_tool("weather_forecast", {})
-        if cmd == "/memory":
-            return _run_tool("memory_recall", {})
-        if cmd == "/remember":
-            if len(parts) < 3:
-                return "Usage: /remember <semantic|procedural> <text>"
-            return _run_tool(
-                "memory_remember",
-                {"section": parts[1], "content": " ".join(parts[2:])},
-            )
-        if cmd == "/pin":
-            if len(parts) < 2:
-                return "Usage: /pin <text>"
-            return _run_tool(
-                "memory_remember",
-                {"section": "pinned", "content": " ".join(parts[1:])},
-            )
-        if cmd == "/unpin":
-            if len(parts) < 2:
-                return "Usage: /unpin <text>"
-            return _run_tool(
-                "memory_forget",
-                {"content": " ".join(parts[1:]), "section": "pinned"},
-            )
-        if cmd == "/pins":
-            content = _load_pinned()
-            if not content.strip():
-                return "No pinned items."
-            return content.strip()
-        if cmd == "/note":
-            if len(parts) < 2:
-                return "Usage: /note <text>"
-            return _run_tool("note_daily", {"content": " ".join(parts[1:])})
-        if cmd == "/read":
-            if len(parts) < 2:
-                return "Usage: /read <url>"
-            return _run_tool("web_read", {"url": parts[1]})
-        if cmd == "/capture":
-            return _dispatch_capture(parts, provider, model)
-        if cmd == "/brief":
-            from tars.brief import build_brief_sections, format_brief_text
-
-            sections = build_brief_sections()
-            return format_brief_text(sections)
-        if cmd in ("/search", "/sgrep", "/svec"):
-            if len(parts) < 2:
-                return f"Usage: {cmd} <query>"
-            mode = {"/search": "hybrid", "/sgrep": "fts", "/svec": "vec"}[cmd]
-            return _dispatch_search(" ".join(parts[1:]), mode=mode)
-        if cmd == "/find":
-            if len(parts) < 2:
-                return "Usage: /find <query>"
-            return _dispatch_find(" ".join(parts[1:]))
-        if cmd == "/sessions":
-            return _dispatch_sessions()
-        if cmd == "/session":
-            return _dispatch_session_search(parts)
-        if cmd == "/continue":
-            return _dispatch_continue(parts, conv)
-        if cmd == "/export":
-            return _export_conversation(conv)
-        if cmd == "/help":
-            return _HELP_TEXT
-        if cmd == "/clear":
-            return "__clear__"
-        if cmd in ("/w", "/r"):
-            return _dispatch_feedback(cmd, parts, conv, context)
-        if cmd == "/review":
-            return _dispatch_review(provider, model)
-        if cmd == "/tidy":
-            return _dispatch_tidy(provider, model)
-        if cmd == "/memory-review":
-            from tars.brief import build_review_sections, format_brief_text
-
-            sections = build_review_sections(provider, model)
-            return format_brief_text(sections)
-        if cmd == "/mcp":
-            return _dispatch_mcp()
-        if cmd == "/stats":
-            return _dispatch_stats()
-        if cmd == "/schedule":
-            return _dispatch_schedule()
-        if cmd == "/model":
-            return _dispatch_model(context)
+        return _COMMANDS[cmd](parts, provider, model, conv, context)
     except Exception as e:
         return _format_error(e)
 
-    return f"Unknown command: {cmd}. Type /help for available commands."
-
 
 def command_names() -> set[str]:
     """Return the set of all registered command names."""
-    return set(_ALL_COMMANDS)
+    return set(_COMMANDS)
 
 
 def _run_tool(name: str, args: dict) -> str:
@@ -672,13 +582,188 @@ def _dispatch_model(context: dict | None) -> str:
     )
 
 
-_ALL_COMMANDS = {
-    "/todoist", "/weather", "/forecast", "/memory", "/remember",
-    "/pin", "/unpin", "/pins", "/note",
-    "/read", "/capture", "/brief",
-    "/search", "/sgrep", "/svec", "/find",
-    "/sessions", "/session", "/continue",
-    "/w", "/r", "/review", "/tidy", "/memory-review",
-    "/mcp", "/stats", "/schedule", "/model",
-    "/export", "/help", "/clear",
+# Handlers share one signature so dispatch is a single table lookup. They
+# resolve _dispatch_* helpers at call time, keeping them patchable in tests.
+_Handler = Callable[[list[str], str, str, "Conversation | None", "dict | None"], str]
+
+_SEARCH_MODES = {"/search": "hybrid", "/sgrep": "fts", "/svec": "vec"}
+
+
+def _cmd_todoist(parts, provider, model, conv, context) -> str:
+    return _dispatch_todoist(parts, provider, model)
+
+
+def _cmd_weather(parts, provider, model, conv, context) -> str:
+    return _run_tool("weather_now", {})
+
+
+def _cmd_forecast(parts, provider, model, conv, context) -> str:
+    return _run_tool("weather_forecast", {})
+
+
+def _cmd_memory(parts, provider, model, conv, context) -> str:
+    return _run_tool("memory_recall", {})
+
+
+def _cmd_remember(parts, provider, model, conv, context) -> str:
+    if len(parts) < 3:
+        return "Usage: /remember <semantic|procedural> <text>"
+    return _run_tool(
+        "memory_remember",
+        {"section": parts[1], "content": " ".join(parts[2:])},
+    )
+
+
+def _cmd_pin(parts, provider, model, conv, context) -> str:
+    if len(parts) < 2:
+        return "Usage: /pin <text>"
+    return _run_tool(
+        "memory_remember",
+        {"section": "pinned", "content": " ".join(parts[1:])},
+    )
+
+
+def _cmd_unpin(parts, provider, model, conv, context) -> str:
+    if len(parts) < 2:
+        return "Usage: /unpin <text>"
+    return _run_tool(
+        "memory_forget",
+        {"content": " ".join(parts[1:]), "section": "pinned"},
+    )
+
+
+def _cmd_pins(parts, provider, model, conv, context) -> str:
+    content = _load_pinned()
+    if not content.strip():
+        return "No pinned items."
+    return content.strip()
+
+
+def _cmd_note(parts, provider, model, conv, context) -> str:
+    if len(parts) < 2:
+        return "Usage: /note <text>"
+    return _run_tool("note_daily", {"content": " ".join(parts[1:])})
+
+
+def _cmd_read(parts, provider, model, conv, context) -> str:
+    if len(parts) < 2:
+        return "Usage: /read <url>"
+    return _run_tool("web_read", {"url": parts[1]})
+
+
+def _cmd_capture(parts, provider, model, conv, context) -> str:
+    return _dispatch_capture(parts, provider, model)
+
+
+def _cmd_brief(parts, provider, model, conv, context) -> str:
+    from tars.brief import build_brief_sections, format_brief_text
+
+    sections = build_brief_sections()
+    return format_brief_text(sections)
+
+
+def _cmd_search(parts, provider, model, conv, context) -> str:
+    cmd = parts[0]
+    if len(parts) < 2:
+        return f"Usage: {cmd} <query>"
+    return _dispatch_search(" ".join(parts[1:]), mode=_SEARCH_MODES[cmd])
+
+
+def _cmd_find(parts, provider, model, conv, context) -> str:
+    if len(parts) < 2:
+        return "Usage: /find <query>"
+    return _dispatch_find(" ".join(parts[1:]))
+
+
+def _cmd_sessions(parts, provider, model, conv, context) -> str:
+    return _dispatch_sessions()
+
+
+def _cmd_session(parts, provider, model, conv, context) -> str:
+    return _dispatch_session_search(parts)
+
+
+def _cmd_continue(parts, provider, model, conv, context) -> str:
+    return _dispatch_continue(parts, conv)
+
+
+def _cmd_export(parts, provider, model, conv, context) -> str:
+    return _export_conversation(conv)
+
+
+def _cmd_help(parts, provider, model, conv, context) -> str:
+    return _HELP_TEXT
+
+
+def _cmd_clear(parts, provider, model, conv, context) -> str:
+    return "__clear__"
+
+
+def _cmd_feedback(parts, provider, model, conv, context) -> str:
+    return _dispatch_feedback(parts[0], parts, conv, context)
+
+
+def _cmd_review(parts, provider, model, conv, context) -> str:
+    return _dispatch_review(provider, model)
+
+
+def _cmd_tidy(parts, provider, model, conv, context) -> str:
+    return _dispatch_tidy(provider, model)
+
+
+def _cmd_memory_review(parts, provider, model, conv, context) -> str:
+    from tars.brief import build_review_sections, format_brief_text
+
+    sections = build_review_sections(provider, model)
+    return format_brief_text(sections)
+
+
+def _cmd_mcp(parts, provider, model, conv, context) -> str:
+    return _dispatch_mcp()
+
+
+def _cmd_stats(parts, provider, model, conv, context) -> str:
+    return _dispatch_stats()
+
+
+def _cmd_schedule(parts, provider, model, conv, context) -> str:
+    return _dispatch_schedule()
+
+
+def _cmd_model(parts, provider, model, conv, context) -> str:
+    return _dispatch_model(context)
+
+
+_COMMANDS: dict[str, _Handler] = {
+    "/todoist": _cmd_todoist,
+    "/weather": _cmd_weather,
+    "/forecast": _cmd_forecast,
+    "/memory": _cmd_memory,
+    "/remember": _cmd_remember,
+    "/pin": _cmd_pin,
+    "/unpin": _cmd_unpin,
+    "/pins": _cmd_pins,
+    "/note": _cmd_note,
+    "/read": _cmd_read,
+    "/capture": _cmd_capture,
+    "/brief": _cmd_brief,
+    "/search": _cmd_search,
+    "/sgrep": _cmd_search,
+    "/svec": _cmd_search,
+    "/find": _cmd_find,
+    "/sessions": _cmd_sessions,
+    "/session": _cmd_session,
+    "/continue": _cmd_continue,
+    "/w": _cmd_feedback,
+    "/r": _cmd_feedback,
+    "/review": _cmd_review,
+    "/tidy": _cmd_tidy,
+    "/memory-review": _cmd_memory_review,
+    "/mcp": _cmd_mcp,
+    "/stats": _cmd_stats,
+    "/schedule": _cmd_schedule,
+    "/model": _cmd_model,
+    "/export": _cmd_export,
+    "/help": _cmd_help,
+    "/clear": _cmd_clear,
 }
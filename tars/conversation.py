@@ -3,14 +3,12 @@ from collections.abc import Generator
 from dataclasses import dataclass, field
 from pathlib import Path
 
-import anthropic
-import openai
-
 from tars.brief import build_daily_context
 from tars.config import ModelConfig
 from tars.core import _search_relevant_context, chat, chat_stream
 from tars.debug import verbose
 from tars.extractor import extract_facts
+from tars.lazy import lazy_import
 from tars.memory import append_daily
 from tars.router import route_message
 from tars.sessions import (
@@ -19,10 +17,22 @@ from tars.sessions import (
     _summarize_session,
 )
 
-_PROVIDER_ERRORS = (
-    anthropic.APIStatusError, anthropic.APIConnectionError, anthropic.APITimeoutError,
-    openai.APIStatusError, openai.APIConnectionError, openai.APITimeoutError,
-)
+anthropic = lazy_import("anthropic")
+openai = lazy_import("openai")
+
+# Built on first use so importing this module doesn't load the SDKs. An
+# except clause only evaluates its expression once an exception is raised.
+_PROVIDER_ERRORS: tuple[type[Exception], ...] | None = None
+
+
+def _provider_errors() -> tuple[type[Exception], ...]:
+    global _PROVIDER_ERRORS
+    if _PROVIDER_ERRORS is None:
+        _PROVIDER_ERRORS = (
+            anthropic.APIStatusError, anthropic.APIConnectionError, anthropic.APITimeoutError,
+            openai.APIStatusError, openai.APIConnectionError, openai.APITimeoutError,
+        )
+    return _PROVIDER_ERRORS
 
 
 @dataclass
@@ -161,7 +171,7 @@ def process_message(
         )
         conv.last_provider = provider
         conv.last_model = model
-    except _PROVIDER_ERRORS as exc:
+    except _provider_errors() as exc:
         if not escalated or not _should_fallback(exc):
             raise
         status = getattr(exc, "status_code", "connection")
@@ -214,7 +224,7 @@ def process_message_stream(
             conv.last_model = model
             full_reply = [reply]
             yield reply
-        except _PROVIDER_ERRORS as exc:
+        except _provider_errors() as exc:
             if not _should_fallback(exc):
                 raise
             status = getattr(exc, "status_code", "connection")
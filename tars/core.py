@@ -4,15 +4,18 @@ import os
 import re
 from collections.abc import Generator
 
-import anthropic
 import ollama
-import openai
 
 from tars.debug import verbose
 from tars.memory import _load_memory, _load_pinned, _load_procedural, append_daily, load_daily
 from tars.format import format_tool_result
+from tars.lazy import lazy_import
 from tars.tools import ANTHROPIC_TOOLS, OLLAMA_TOOLS, get_all_tools, run_tool
 
+anthropic = lazy_import("anthropic")
+openai = lazy_import("openai")
+
+
 def _openai_base_url() -> str:
     return os.environ.get("TARS_OPENAI_BASE_URL", "").strip() or "http://localhost:8000/v1"
 
@@ -1,5 +1,6 @@
 """sqlite-vec database for chunk embeddings."""
 
+import functools
 import os
 import re
 import sqlite3
@@ -11,9 +12,14 @@ import sqlite_vec
 from tars.memory import _memory_dir
 
 
+@functools.cache
+def _f32_struct(dim: int) -> struct.Struct:
+    return struct.Struct(f"<{dim}f")
+
+
 def _serialize_f32(vector: list[float]) -> bytes:
     """Pack a float list into raw little-endian f32 bytes for sqlite-vec."""
-    return struct.pack(f"<{len(vector)}f", *vector)
+    return _f32_struct(len(vector)).pack(*vector)
 
 
 def _db_path() -> Path | None:
@@ -36,7 +42,10 @@ def _connect(db_file: Path) -> sqlite3.Connection:
     conn.enable_load_extension(True)
     sqlite_vec.load(conn)
     conn.enable_load_extension(False)
-    conn.execute("PRAGMA journal_mode=WAL")
+    if str(db_file) != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL is crash-safe at NORMAL; FULL only adds an fsync per commit.
+        conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys=ON")
     conn.row_factory = sqlite3.Row
     return conn
@@ -385,16 +394,15 @@ def insert_chunks(
 
     Does not commit — caller is responsible for transaction management.
     """
-    count = min(len(chunks), len(embeddings))
-    for i in range(count):
-        chunk = chunks[i]
+    fts_rows = []
+    for chunk, embedding in zip(chunks, embeddings):
         cur = conn.execute(
             """\
             INSERT INTO vec_chunks (embedding, file_id, chunk_sequence,
                                     content_hash, start_line, end_line, content)
             VALUES (?, ?, ?, ?, ?, ?, ?)""",
             (
-                _serialize_f32(embeddings[i]),
+                _serialize_f32(embedding),
                 file_id,
                 chunk.sequence,
                 chunk.content_hash,
@@ -403,10 +411,11 @@ def insert_chunks(
                 chunk.content,
             ),
         )
-        conn.execute(
-            "INSERT INTO chunks_fts (rowid, content) VALUES (?, ?)",
-            (cur.lastrowid, chunk.content),
-        )
+        fts_rows.append((cur.lastrowid, chunk.content))
+    conn.executemany(
+        "INSERT INTO chunks_fts (rowid, content) VALUES (?, ?)",
+        fts_rows,
+    )
 
 
 def _file_links_table_exists(conn: sqlite3.Connection) -> bool:
@@ -8,6 +8,7 @@ import re
 import smtplib
 import sys
 import time
+from collections.abc import Container
 from email.message import EmailMessage
 from email.mime.text import MIMEText
 from pathlib import Path
@@ -49,30 +50,34 @@ def _extract_body(msg: email.message.Message) -> str:
     """
     body = ""
     if msg.is_multipart():
+        # One walk that keeps the two-pass rules: the first text/plain part
+        # decides the plain body even when it is empty, and the fallback is
+        # the first text/html part anywhere in the message.
+        html_part = None
+        plain_seen = False
         for part in msg.walk():
             # Skip attachment parts — only consider inline/body text.
             if part.get_content_disposition() == "attachment":
                 continue
             ct = part.get_content_type()
-            if ct == "text/plain":
+            if ct == "text/plain" and not plain_seen:
+                plain_seen = True
                 payload = part.get_payload(decode=True)
                 if payload:
                     charset = part.get_content_charset() or "utf-8"
                     body = payload.decode(charset, errors="replace")
+                    break
+            elif ct == "text/html" and html_part is None:
+                html_part = part
+            if plain_seen and html_part is not None:
                 break
         # Fallback: try text/html if no text/plain found
-        if not body:
-            for part in msg.walk():
-                if part.get_content_disposition() == "attachment":
-                    continue
-                ct = part.get_content_type()
-                if ct == "text/html":
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        charset = part.get_content_charset() or "utf-8"
-                        html = payload.decode(charset, errors="replace")
-                        body = _strip_html(html)
-                    break
+        if not body and html_part is not None:
+            payload = html_part.get_payload(decode=True)
+            if payload:
+                charset = html_part.get_content_charset() or "utf-8"
+                html = payload.decode(charset, errors="replace")
+                body = _strip_html(html)
     else:
         payload = msg.get_payload(decode=True)
         if payload:
@@ -85,11 +90,13 @@ def _extract_body(msg: email.message.Message) -> str:
     return "\n".join(cleaned).strip()
 
 
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _strip_html(html: str) -> str:
     """Basic HTML tag removal for fallback body extraction."""
-    text = re.sub(r"<br\s*/?>", "\n", html, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", "", text)
-    return text.strip()
+    return _TAG_RE.sub("", _BR_RE.sub("\n", html)).strip()
 
 
 def _thread_id(msg: email.message.Message) -> str:
@@ -99,15 +106,15 @@ def _thread_id(msg: email.message.Message) -> str:
     or the message's own Message-ID for new threads.
     """
     refs = msg.get("References", "")
-    if refs:
-        # References is space-separated; first entry is the root
-        ids = refs.strip().split()
-        if ids:
-            return ids[0]
+    # References is whitespace-separated (possibly folded); first entry is
+    # the root. maxsplit=1 stops after it instead of splitting the chain.
+    ids = refs.split(None, 1)
+    if ids:
+        return ids[0]
     return msg.get("Message-ID", f"unknown-{time.time()}")
 
 
-def _is_allowed_sender(msg: email.message.Message, allowed: list[str]) -> bool:
+def _is_allowed_sender(msg: email.message.Message, allowed: Container[str]) -> bool:
     """Check if the sender is in the whitelist."""
     from_header = msg.get("From", "")
     # Extract email address from "Name <addr>" format
@@ -123,7 +130,7 @@ def _connect_imap(address: str, password: str) -> imaplib.IMAP4_SSL:
 
 
 def _fetch_unseen(
-    imap: imaplib.IMAP4_SSL, allowed: list[str],
+    imap: imaplib.IMAP4_SSL, allowed: Container[str],
 ) -> list[tuple[bytes, email.message.Message]]:
     """Fetch unread emails, filtered to allowed senders.
 
@@ -135,20 +142,22 @@ def _fetch_unseen(
     if not data or not data[0]:
         return []
 
+    # One FETCH for the whole batch: payloads come back as
+    # (b"<num> (BODY[] {size}", raw) tuples, interleaved with b")" lines.
+    _, msg_data = imap.fetch(b",".join(data[0].split()), "(BODY.PEEK[])")
     messages = []
-    for num in data[0].split():
-        _, msg_data = imap.fetch(num, "(BODY.PEEK[])")
-        if not msg_data or not msg_data[0]:
-            continue
-        raw = msg_data[0]
-        if isinstance(raw, tuple) and len(raw) >= 2:
-            msg = email.message_from_bytes(raw[1])
-        else:
+    disallowed = []
+    for item in msg_data or []:
+        if not isinstance(item, tuple) or len(item) < 2:
             continue
+        num = item[0].split(None, 1)[0]
+        msg = email.message_from_bytes(item[1])
         if _is_allowed_sender(msg, allowed):
             messages.append((num, msg))
         else:
-            imap.store(num, "+FLAGS", "\\Seen")
+            disallowed.append(num)
+    if disallowed:
+        imap.store(b",".join(disallowed), "+FLAGS", "\\Seen")
 
     return messages
 
@@ -261,6 +270,7 @@ def run_email(model_config: ModelConfig) -> None:
     )
 
     imap: imaplib.IMAP4_SSL | None = None
+    allowed = frozenset(email_config["allow"])
 
     try:
         while True:
@@ -275,7 +285,7 @@ def run_email(model_config: ModelConfig) -> None:
                     continue
 
             try:
-                emails = _fetch_unseen(imap, email_config["allow"])
+                emails = _fetch_unseen(imap, allowed)
             except (imaplib.IMAP4.error, OSError) as e:
                 print(f"email: fetch failed, reconnecting: {e}", file=sys.stderr)
                 imap = None
@@ -110,19 +110,18 @@ def format_weather_forecast(raw: str) -> str:
     hourly = data.get("hourly", [])
     if not hourly:
         return "no forecast data"
-    # Show every 3 hours in two columns for compactness.
-    entries = []
-    for h in hourly:
+    # Show every 3 hours in two columns for compactness; skipped hours
+    # are never formatted.
+    selected = []
+    for h in hourly[::3]:
         t = h.get("time", "")[-5:]
         tc = h.get("temp_c", "?")
         prob = h.get("precip_prob_pct", 0)
         icon = _precip_icon(prob)
         if prob > 0:
-            entries.append(f"{t} {tc:>4}\u00b0 {icon}{prob}%")
+            selected.append(f"{t} {tc:>4}\u00b0 {icon}{prob}%")
         else:
-            entries.append(f"{t} {tc:>4}\u00b0")
-    # Every 3 hours
-    selected = entries[::3]
+            selected.append(f"{t} {tc:>4}\u00b0")
     mid = (len(selected) + 1) // 2
     lines = []
     for i in range(mid):
@@ -0,0 +1,25 @@
+"""Deferred module imports for heavy optional SDKs."""
+
+import importlib
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """Return module `name`, deferring its body until first attribute access.
+
+    The anthropic and openai SDKs take over a second to import, which every
+    entry point paid through cli.py even when, like `tars index`, it never
+    calls them.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return importlib.import_module(name)  # raises ModuleNotFoundError
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
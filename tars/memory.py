@@ -111,15 +111,15 @@ def load_feedback() -> tuple[str, str]:
     md = _memory_dir()
     if not md:
         return "", ""
-    corrections = ""
-    rewards = ""
-    cp = md / "corrections.md"
-    rp = md / "rewards.md"
-    if cp.exists():
-        corrections = cp.read_text(encoding="utf-8", errors="replace")
-    if rp.exists():
-        rewards = rp.read_text(encoding="utf-8", errors="replace")
-    return corrections, rewards
+    return _read_if_exists(md / "corrections.md"), _read_if_exists(md / "rewards.md")
+
+
+def _read_if_exists(p: Path) -> str:
+    """Read p, or return "" if it is missing, without a separate exists() stat."""
+    try:
+        return p.read_text(encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
 
 
 def archive_feedback() -> None:
@@ -146,9 +146,22 @@ def save_reward(user_msg: str, assistant_msg: str, note: str = "") -> str:
     return _save_feedback("rewards.md", "Rewards", user_msg, assistant_msg, note)
 
 
-def _append_to_file(p: Path, content: str) -> None:
-    """Append a list item to a memory file, replacing comment placeholders."""
-    text = p.read_text(encoding="utf-8", errors="replace") if p.exists() else ""
+def _append_to_file(p: Path, content: str, text: str | None = None) -> None:
+    """Append a list item to a memory file, replacing comment placeholders.
+
+    Callers that have just read the file can pass its contents as text.
+    """
+    if text is None:
+        text = p.read_text(encoding="utf-8", errors="replace") if p.exists() else ""
+    body = text.rstrip()
+    tail = text[len(body):]
+    if body and tail in ("", "\n") and not MEMORY_PLACEHOLDER_RE.search(text):
+        # Nothing to strip or normalise, so the rewrite below would only add
+        # the item at the end: append it instead of rewriting the file.
+        sep = "" if tail else "\n"
+        with p.open("a", encoding="utf-8", errors="replace") as f:
+            f.write(f"{sep}- {content}\n")
+        return
     # Remove only the dedicated placeholder comment, not arbitrary HTML comments.
     text = MEMORY_PLACEHOLDER_RE.sub("", text)
     text = text.rstrip() + f"\n- {content}\n"
@@ -251,5 +264,5 @@ def _run_memory_tool(name: str, args: dict) -> str:
     existing = p.read_text(encoding="utf-8", errors="replace") if p.exists() else ""
     if f"- {content}" in existing:
         return json.dumps({"ok": True, "section": section, "content": content, "note": "already exists"})
-    _append_to_file(p, content)
+    _append_to_file(p, content, existing)
     return json.dumps({"ok": True, "section": section, "content": content})
@@ -7,7 +7,7 @@ from tars.config import ModelConfig
 from tars.debug import verbose
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RouteResult:
     provider: str
     model: str
@@ -105,6 +105,53 @@ _TOOL_HINT_PATTERNS: list[tuple[str, list[str]]] = [
 _COMPILED_HINT_PATTERNS = [(re.compile(p, re.IGNORECASE), hints) for p, hints in _TOOL_HINT_PATTERNS]
 
 
+def _has_top_level_alternation(pattern: str) -> bool:
+    """True if pattern contains a `|` outside any group or character class."""
+    depth = 0
+    in_class = escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+    return False
+
+
+def _any_hint_re(patterns: list[str]) -> re.Pattern[str]:
+    """One alternation of patterns that matches iff at least one of them does.
+
+    Most messages carry no tool intent, so this rejects them in one scan
+    before the per-pattern loop. A shared leading \\b is factored out so the
+    engine tests the word boundary once per position, not once per branch.
+    That is only equivalent when the rest of the pattern has no top-level
+    `|`: `\\bfoo|bar` does not put \\b in front of bar.
+    """
+    bodies = []
+    others = []
+    for p in patterns:
+        if p.startswith(r"\b") and not _has_top_level_alternation(p):
+            bodies.append(p.removeprefix(r"\b"))
+        else:
+            others.append(p)
+    branches = [f"(?:{p})" for p in others]
+    if bodies:
+        branches.append(r"\b(?:" + "|".join(f"(?:{b})" for b in bodies) + ")")
+    return re.compile("|".join(branches), re.IGNORECASE)
+
+
+_ANY_HINT_RE = _any_hint_re([p for p, _ in _TOOL_HINT_PATTERNS])
+
+
 def update_tool_names(names: set[str]) -> None:
     """Add MCP tool names to the set used for tool-intent detection."""
     _TOOL_NAMES.update(names)
@@ -120,6 +167,9 @@ def _has_tool_intent(text: str) -> tuple[str | None, list[str]]:
         if name in lower:
             return name, [name]
 
+    if not _ANY_HINT_RE.search(text):
+        return None, []
+
     trigger = None
     seen: set[str] = set()
     hints: list[str] = []
@@ -418,10 +418,14 @@ def search_expanded(
         ranked_lists: list[list[int]] = []
         oversample = limit * 2
 
-        for q in queries:
-            if mode in ("hybrid", "vec"):
-                q_vec = embed(q, model=vec_model, instruct=instruct)[0]
-                ranked_lists.append(search_vec(conn, q_vec, limit=oversample))
+        # One embed round trip for every expanded query instead of one each.
+        q_vecs: list[list[float]] = []
+        if mode in ("hybrid", "vec") and queries:
+            q_vecs = embed(queries, model=vec_model, instruct=instruct)
+
+        for i, q in enumerate(queries):
+            if i < len(q_vecs):
+                ranked_lists.append(search_vec(conn, q_vecs[i], limit=oversample))
             if mode in ("hybrid", "fts"):
                 ranked_lists.append(search_fts(conn, q, limit=oversample))
 
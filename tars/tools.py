@@ -525,7 +525,14 @@ def _resolve_td() -> str | None:
     return None
 
 
-def run_tool(name: str, args: dict, *, quiet: bool = False) -> str:
+def run_tool(
+    name: str,
+    args: dict,
+    *,
+    quiet: bool = False,
+    mcp_client: MCPClient | None = None,
+) -> str:
+    client = mcp_client or _mcp_client
     args = _clean_args(args)
     missing = [f for f in _TOOL_REQUIRED.get(name, []) if f not in args]
     if missing:
@@ -567,8 +574,8 @@ def run_tool(name: str, args: dict, *, quiet: bool = False) -> str:
         elif name == "todoist_complete_task":
             cmd = [td_bin, "task", "complete", args["ref"]]
         else:
-            if _mcp_client and "." in name:
-                return _mcp_client.call_tool(name, args)
+            if client and "." in name:
+                return client.call_tool(name, args)
             return json.dumps({"error": f"Unknown tool: {name}"})
 
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
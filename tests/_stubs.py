@@ -0,0 +1,71 @@
+"""Shared test bootstrap: stubs the provider SDKs before any tars import.
+
+Test modules `import tests._stubs` before importing tars. tests/ is a
+package, so the absolute import resolves both under
+`python -m unittest discover -s tests` and for a single module run as
+`python -m unittest tests.test_conversation` from the repo root. Module
+caching means the body runs once per process.
+"""
+
+import contextlib
+import os
+import sys
+import types
+
+
+def _unpatched(*args, **kwargs):
+    raise RuntimeError("provider SDK stub called without a test patch")
+
+
+# Plain namespaces rather than Mock: only the entry points tars calls exist,
+# and they fail loudly if a test forgets to patch them.
+sys.modules.setdefault("anthropic", types.SimpleNamespace(Anthropic=_unpatched))
+sys.modules.setdefault("ollama", types.SimpleNamespace(chat=_unpatched, embed=_unpatched))
+sys.modules.setdefault("openai", types.SimpleNamespace(OpenAI=_unpatched))
+sys.modules.setdefault("dotenv", types.SimpleNamespace(load_dotenv=lambda: None))
+
+# Provider fallback catches these by type (conversation._PROVIDER_ERRORS), so
+# they must be real exception classes. Installed unconditionally: the real SDK
+# classes need response/body arguments that tests don't construct.
+_APIStatusError = type("APIStatusError", (Exception,), {"status_code": 0})
+sys.modules["anthropic"].APIStatusError = _APIStatusError
+sys.modules["anthropic"].RateLimitError = type("RateLimitError", (_APIStatusError,), {"status_code": 429})
+sys.modules["anthropic"].BadRequestError = type("BadRequestError", (_APIStatusError,), {"status_code": 400})
+sys.modules["anthropic"].APIConnectionError = type("APIConnectionError", (Exception,), {})
+sys.modules["anthropic"].APITimeoutError = type("APITimeoutError", (Exception,), {})
+
+_OAIAPIStatusError = type("APIStatusError", (Exception,), {"status_code": 0})
+sys.modules["openai"].APIStatusError = _OAIAPIStatusError
+sys.modules["openai"].APIConnectionError = type("APIConnectionError", (Exception,), {})
+sys.modules["openai"].APITimeoutError = type("APITimeoutError", (Exception,), {})
+
+
+@contextlib.contextmanager
+def swap_attr(obj, name: str, value):
+    """Temporarily replace obj.name with value — a lighter patch.object for stubs
+    that only need to return something, with no call recording."""
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield value
+    finally:
+        setattr(obj, name, original)
+
+
+@contextlib.contextmanager
+def set_env(**values: str):
+    """Temporarily set environment variables, restoring only those keys.
+
+    mock.patch.dict(os.environ, ...) snapshots and rewrites the whole
+    environment; keep using it where a test needs clear=True.
+    """
+    old = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in old.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
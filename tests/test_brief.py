@@ -1,12 +1,9 @@
 """Tests for the daily brief module."""
 
-import sys
 import unittest
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars.brief import build_brief_sections, build_daily_context, build_review_sections, format_brief_cli, format_brief_text
 
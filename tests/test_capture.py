@@ -1,14 +1,11 @@
 import json
 import os
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars.capture import _conversation_context, _extract_title, _sanitize_filename, capture
 
@@ -1,13 +1,10 @@
 import os
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars.cli import _apply_review, _apply_tidy, _completer
 
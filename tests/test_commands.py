@@ -1,15 +1,30 @@
 """Tests for the shared command dispatch module."""
 
-import sys
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
-
-from tars.commands import _export_conversation, _format_error, _parse_todoist_add, command_names, dispatch
+import tests._stubs  # noqa: F401
+
+from tars import brief as _brief
+from tars import commands as _cmd
+from tars import core as _core
+from tars import memory as _memory
+from tars import search as _search
+from tars import sessions as _sess
+from tars.commands import (
+    _COMMANDS,
+    _dispatch_search,
+    _dispatch_sessions,
+    _export_conversation,
+    _format_error,
+    _parse_todoist_add,
+    command_names,
+    dispatch,
+)
+from tars.config import ModelConfig
+from tars.conversation import Conversation
+from tars.sessions import SessionInfo
 
 
 class ParseTodoistAddTests(unittest.TestCase):
@@ -65,31 +80,31 @@ class DispatchTests(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn("Unknown command", result)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_weather(self, mock_run) -> None:
         result = dispatch("/weather")
         self.assertIsNotNone(result)
         mock_run.assert_called_once_with("weather_now", {}, quiet=True)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_forecast(self, mock_run) -> None:
         result = dispatch("/forecast")
         self.assertIsNotNone(result)
         mock_run.assert_called_once_with("weather_forecast", {}, quiet=True)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_todoist_today(self, mock_run) -> None:
         result = dispatch("/todoist today")
         self.assertIsNotNone(result)
         mock_run.assert_called_once_with("todoist_today", {}, quiet=True)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_todoist_upcoming(self, mock_run) -> None:
         result = dispatch("/todoist upcoming")
         self.assertIsNotNone(result)
         mock_run.assert_called_once_with("todoist_upcoming", {"days": 7}, quiet=True)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_todoist_upcoming_with_days(self, mock_run) -> None:
         result = dispatch("/todoist upcoming 5")
         self.assertIsNotNone(result)
@@ -99,7 +114,7 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/todoist upcoming abc")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_todoist_complete(self, mock_run) -> None:
         result = dispatch("/todoist complete buy eggs")
         self.assertIsNotNone(result)
@@ -107,7 +122,7 @@ class DispatchTests(unittest.TestCase):
             "todoist_complete_task", {"ref": "buy eggs"}, quiet=True
         )
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_todoist_add_with_flags(self, mock_run) -> None:
         result = dispatch("/todoist add buy eggs --due tomorrow")
         self.assertIsNotNone(result)
@@ -116,9 +131,9 @@ class DispatchTests(unittest.TestCase):
         self.assertEqual(call_args[0][1]["content"], "buy eggs")
         self.assertEqual(call_args[0][1]["due"], "tomorrow")
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
-    @mock.patch(
-        "tars.commands._parse_todoist_natural",
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
+    @mock.patch.object(
+        _cmd, "_parse_todoist_natural",
         return_value={"content": "eggs", "project": "Groceries"},
     )
     def test_todoist_add_natural_language(self, mock_parse, mock_run) -> None:
@@ -129,7 +144,7 @@ class DispatchTests(unittest.TestCase):
         self.assertEqual(call_args[0][1]["content"], "eggs")
         self.assertEqual(call_args[0][1]["project"], "Groceries")
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_todoist_add_flags_bypass_model(self, mock_run) -> None:
         result = dispatch(
             "/todoist add buy eggs --project Groceries", "ollama", "llama3.1:8b"
@@ -143,7 +158,7 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/todoist add")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_note(self, mock_run) -> None:
         result = dispatch("/note interesting idea")
         self.assertIsNotNone(result)
@@ -155,7 +170,7 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/note")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_remember(self, mock_run) -> None:
         result = dispatch("/remember semantic important fact")
         self.assertIsNotNone(result)
@@ -169,13 +184,13 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/remember")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_memory(self, mock_run) -> None:
         result = dispatch("/memory")
         self.assertIsNotNone(result)
         mock_run.assert_called_once_with("memory_recall", {}, quiet=True)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"url": "https://example.com", "content": "hello"}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"url": "https://example.com", "content": "hello"}')
     def test_read(self, mock_run) -> None:
         result = dispatch("/read https://example.com")
         self.assertIsNotNone(result)
@@ -187,7 +202,7 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/read")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands._dispatch_capture")
+    @mock.patch.object(_cmd, "_dispatch_capture")
     def test_capture(self, mock_cap) -> None:
         mock_cap.return_value = "Captured: test"
         result = dispatch("/capture https://example.com", "ollama", "llama3.1:8b")
@@ -197,7 +212,7 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/capture")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands._dispatch_capture")
+    @mock.patch.object(_cmd, "_dispatch_capture")
     def test_capture_raw_flag(self, mock_cap) -> None:
         mock_cap.return_value = "Raw captured"
         dispatch("/capture https://example.com --raw", "ollama", "llama3.1:8b")
@@ -205,13 +220,13 @@ class DispatchTests(unittest.TestCase):
             ["/capture", "https://example.com", "--raw"], "ollama", "llama3.1:8b"
         )
 
-    @mock.patch("tars.brief.build_brief_sections", return_value=[("tasks", "list")])
-    @mock.patch("tars.brief.format_brief_text", return_value="brief output")
+    @mock.patch.object(_brief, "build_brief_sections", return_value=[("tasks", "list")])
+    @mock.patch.object(_brief, "format_brief_text", return_value="brief output")
     def test_brief(self, mock_fmt, mock_sections) -> None:
         result = dispatch("/brief")
         self.assertEqual(result, "brief output")
 
-    @mock.patch("tars.commands._dispatch_search", return_value="1. result")
+    @mock.patch.object(_cmd, "_dispatch_search", return_value="1. result")
     def test_search(self, mock_search) -> None:
         result = dispatch("/search weather")
         self.assertEqual(result, "1. result")
@@ -220,7 +235,7 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/search")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands._dispatch_find", return_value="1. note result")
+    @mock.patch.object(_cmd, "_dispatch_find", return_value="1. note result")
     def test_find(self, mock_find) -> None:
         result = dispatch("/find weather")
         self.assertEqual(result, "1. note result")
@@ -229,12 +244,12 @@ class DispatchTests(unittest.TestCase):
         result = dispatch("/find")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands._dispatch_sessions", return_value="2026-02-20  Weather talk")
+    @mock.patch.object(_cmd, "_dispatch_sessions", return_value="2026-02-20  Weather talk")
     def test_sessions(self, mock_sessions) -> None:
         result = dispatch("/sessions")
         self.assertIn("Weather talk", result)
 
-    @mock.patch("tars.commands.run_tool", side_effect=Exception("boom"))
+    @mock.patch.object(_cmd, "run_tool", side_effect=Exception("boom"))
     def test_tool_error(self, mock_run) -> None:
         result = dispatch("/weather")
         self.assertIn("Error: boom", result)
@@ -243,8 +258,6 @@ class DispatchTests(unittest.TestCase):
 
 class ExportTests(unittest.TestCase):
     def test_export_with_messages(self) -> None:
-        from tars.conversation import Conversation
-
         conv = Conversation(id="test-1", provider="ollama", model="test")
         conv.messages = [
             {"role": "user", "content": "hello"},
@@ -262,8 +275,6 @@ class ExportTests(unittest.TestCase):
         self.assertEqual(result, "No conversation to export.")
 
     def test_export_empty_conversation(self) -> None:
-        from tars.conversation import Conversation
-
         conv = Conversation(id="test-2", provider="ollama", model="test")
         result = _export_conversation(conv)
         self.assertEqual(result, "No conversation to export.")
@@ -290,13 +301,12 @@ class CentralizedDispatchTests(unittest.TestCase):
         self.assertIn("/todoist", result)
         self.assertIn("/help", result)
 
-    @mock.patch("tars.commands._dispatch_stats", return_value="db: 1 MB")
+    @mock.patch.object(_cmd, "_dispatch_stats", return_value="db: 1 MB")
     def test_dispatch_stats(self, mock_stats) -> None:
         result = dispatch("/stats")
         self.assertEqual(result, "db: 1 MB")
 
     def test_dispatch_model_with_config(self) -> None:
-        from tars.config import ModelConfig
         config = ModelConfig(
             primary_provider="claude",
             primary_model="sonnet",
@@ -312,7 +322,6 @@ class CentralizedDispatchTests(unittest.TestCase):
         self.assertIn("no model config", result)
 
     def test_dispatch_model_from_telegram(self) -> None:
-        from tars.config import ModelConfig
         config = ModelConfig(
             primary_provider="claude",
             primary_model="sonnet",
@@ -324,7 +333,6 @@ class CentralizedDispatchTests(unittest.TestCase):
         self.assertIn("remote: claude:opus", result)
 
     def test_dispatch_model_from_email(self) -> None:
-        from tars.config import ModelConfig
         config = ModelConfig(
             primary_provider="ollama",
             primary_model="llama3.1:8b",
@@ -335,13 +343,13 @@ class CentralizedDispatchTests(unittest.TestCase):
         self.assertIn("primary: ollama:llama3.1:8b", result)
         self.assertIn("remote: none", result)
 
-    @mock.patch("tars.commands._dispatch_search", return_value="1. result")
+    @mock.patch.object(_cmd, "_dispatch_search", return_value="1. result")
     def test_dispatch_sgrep(self, mock_search) -> None:
         result = dispatch("/sgrep test query")
         self.assertEqual(result, "1. result")
         mock_search.assert_called_once_with("test query", mode="fts")
 
-    @mock.patch("tars.commands._dispatch_search", return_value="1. result")
+    @mock.patch.object(_cmd, "_dispatch_search", return_value="1. result")
     def test_dispatch_svec(self, mock_search) -> None:
         result = dispatch("/svec test query")
         self.assertEqual(result, "1. result")
@@ -355,43 +363,40 @@ class CentralizedDispatchTests(unittest.TestCase):
         result = dispatch("/svec")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.search.search_expanded", return_value=[])
-    @mock.patch("tars.search.search", return_value=[])
+    @mock.patch.object(_search, "search_expanded", return_value=[])
+    @mock.patch.object(_search, "search", return_value=[])
     def test_expand_flag_at_start(self, mock_search, mock_expanded) -> None:
-        from tars.commands import _dispatch_search
         _dispatch_search("--expand some query")
         mock_expanded.assert_called_once()
         mock_search.assert_not_called()
         self.assertEqual(mock_expanded.call_args[0][0], "some query")
 
-    @mock.patch("tars.search.search_expanded", return_value=[])
-    @mock.patch("tars.search.search", return_value=[])
+    @mock.patch.object(_search, "search_expanded", return_value=[])
+    @mock.patch.object(_search, "search", return_value=[])
     def test_expand_short_flag_at_start(self, mock_search, mock_expanded) -> None:
-        from tars.commands import _dispatch_search
         _dispatch_search("-e some query")
         mock_expanded.assert_called_once()
 
-    @mock.patch("tars.search.search_expanded", return_value=[])
-    @mock.patch("tars.search.search", return_value=[])
+    @mock.patch.object(_search, "search_expanded", return_value=[])
+    @mock.patch.object(_search, "search", return_value=[])
     def test_expand_flag_mid_query_not_consumed(self, mock_search, mock_expanded) -> None:
-        from tars.commands import _dispatch_search
         _dispatch_search("grep -e pattern")
         mock_search.assert_called_once()
         mock_expanded.assert_not_called()
         self.assertEqual(mock_search.call_args[0][0], "grep -e pattern")
 
     def test_dispatch_help(self) -> None:
-        result = dispatch("/help")
+        result = _COMMANDS["/help"](["/help"], "", "", None, None)
         self.assertIn("/todoist", result)
         self.assertIn("/weather", result)
         self.assertIn("/search", result)
         self.assertIn("/help", result)
 
     def test_dispatch_clear(self) -> None:
-        result = dispatch("/clear")
+        result = _COMMANDS["/clear"](["/clear"], "", "", None, None)
         self.assertEqual(result, "__clear__")
 
-    @mock.patch("tars.commands._dispatch_session_search", return_value="1. session result")
+    @mock.patch.object(_cmd, "_dispatch_session_search", return_value="1. session result")
     def test_dispatch_session_search(self, mock_search) -> None:
         result = dispatch("/session test")
         self.assertEqual(result, "1. session result")
@@ -400,13 +405,12 @@ class CentralizedDispatchTests(unittest.TestCase):
         result = dispatch("/session")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands._dispatch_schedule", return_value="no schedules installed")
+    @mock.patch.object(_cmd, "_dispatch_schedule", return_value="no schedules installed")
     def test_dispatch_schedule(self, mock_sched) -> None:
         result = dispatch("/schedule")
         self.assertEqual(result, "no schedules installed")
 
     def test_command_names_complete(self) -> None:
-        names = command_names()
         expected = {
             "/todoist", "/weather", "/forecast", "/memory", "/remember",
             "/pin", "/unpin", "/pins", "/note",
@@ -417,38 +421,34 @@ class CentralizedDispatchTests(unittest.TestCase):
             "/mcp", "/stats", "/schedule", "/model",
             "/export", "/help", "/clear",
         }
-        self.assertEqual(names, expected)
+        self.assertEqual(_COMMANDS.keys(), expected)
+        self.assertEqual(command_names(), expected)
 
-    @mock.patch("tars.commands._dispatch_continue", return_value="Continuing from 2026-01-02")
+    @mock.patch.object(_cmd, "_dispatch_continue", return_value="Continuing from 2026-01-02")
     def test_dispatch_continue(self, mock_cont) -> None:
-        from tars.conversation import Conversation
         conv = Conversation(id="test", provider="ollama", model="test")
         result = dispatch("/continue", conv=conv)
         self.assertEqual(result, "Continuing from 2026-01-02")
 
     def test_dispatch_continue_blocks_with_messages(self) -> None:
-        from tars.conversation import Conversation
         conv = Conversation(id="test", provider="ollama", model="test")
         conv.messages.append({"role": "user", "content": "hello"})
         result = dispatch("/continue", conv=conv)
         self.assertIn("already has messages", result)
 
     def test_dispatch_continue_no_sessions(self) -> None:
-        from tars.conversation import Conversation
         conv = Conversation(id="test", provider="ollama", model="test")
-        with mock.patch("tars.sessions.load_recent_session", return_value=None):
+        with mock.patch.object(_sess, "load_recent_session", return_value=None):
             result = dispatch("/continue", conv=conv)
         self.assertIn("No previous sessions", result)
 
     def test_dispatch_continue_loads_recent(self) -> None:
-        from tars.conversation import Conversation
-        from tars.sessions import SessionInfo
         conv = Conversation(id="test", provider="ollama", model="test")
         info = SessionInfo(
             path=Path("/fake/session.md"), date="2026-01-02 10:00",
             title="Weather chat", filename="2026-01-02T10-00-00-cli", channel="cli",
         )
-        with mock.patch("tars.sessions.load_recent_session", return_value=("# Session\n\n- weather", info)):
+        with mock.patch.object(_sess, "load_recent_session", return_value=("# Session\n\n- weather", info)):
             result = dispatch("/continue", conv=conv)
         self.assertIn("2026-01-02", result)
         self.assertIn("[cli]", result)
@@ -456,26 +456,24 @@ class CentralizedDispatchTests(unittest.TestCase):
         self.assertIn("weather", conv.messages[1]["content"])
 
     def test_dispatch_feedback_w(self) -> None:
-        from tars.conversation import Conversation
         conv = Conversation(id="test", provider="ollama", model="test")
         conv.messages = [
             {"role": "user", "content": "hello"},
             {"role": "assistant", "content": "hi there"},
         ]
-        with mock.patch("tars.commands.save_correction", return_value="feedback saved") as mock_save:
+        with mock.patch.object(_cmd, "save_correction", return_value="feedback saved") as mock_save:
             result = dispatch("/w bad answer", conv=conv, context={"channel": "cli"})
         self.assertEqual(result, "feedback saved")
         mock_save.assert_called_once_with("hello", "hi there", "bad answer")
 
     def test_dispatch_feedback_no_messages(self) -> None:
-        from tars.conversation import Conversation
         conv = Conversation(id="test", provider="ollama", model="test")
         result = dispatch("/w", conv=conv, context={"channel": "cli"})
         self.assertIn("nothing to flag", result)
 
 
 class PinCommandTests(unittest.TestCase):
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_pin(self, mock_run) -> None:
         result = dispatch("/pin watching Severance S2")
         self.assertIsNotNone(result)
@@ -489,7 +487,7 @@ class PinCommandTests(unittest.TestCase):
         result = dispatch("/pin")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands.run_tool", return_value='{"ok": true}')
+    @mock.patch.object(_cmd, "run_tool", return_value='{"ok": true}')
     def test_unpin(self, mock_run) -> None:
         result = dispatch("/unpin watching Severance S2")
         self.assertIsNotNone(result)
@@ -503,13 +501,13 @@ class PinCommandTests(unittest.TestCase):
         result = dispatch("/unpin")
         self.assertIn("Usage", result)
 
-    @mock.patch("tars.commands._load_pinned", return_value="- watching Severance S2\n- reading Dune\n")
+    @mock.patch.object(_cmd, "_load_pinned", return_value="- watching Severance S2\n- reading Dune\n")
     def test_pins_shows_content(self, mock_load) -> None:
         result = dispatch("/pins")
         self.assertIn("watching Severance S2", result)
         self.assertIn("reading Dune", result)
 
-    @mock.patch("tars.commands._load_pinned", return_value="")
+    @mock.patch.object(_cmd, "_load_pinned", return_value="")
     def test_pins_empty(self, mock_load) -> None:
         result = dispatch("/pins")
         self.assertEqual(result, "No pinned items.")
@@ -522,16 +520,16 @@ class PinCommandTests(unittest.TestCase):
 
 
 class MemoryReviewDispatchTests(unittest.TestCase):
-    @mock.patch("tars.brief.build_review_sections", return_value=[("tidy", "clean"), ("review", "rules")])
-    @mock.patch("tars.brief.format_brief_text", return_value="formatted review")
+    @mock.patch.object(_brief, "build_review_sections", return_value=[("tidy", "clean"), ("review", "rules")])
+    @mock.patch.object(_brief, "format_brief_text", return_value="formatted review")
     def test_memory_review_dispatch(self, mock_fmt, mock_sections) -> None:
         result = dispatch("/memory-review", "claude", "sonnet")
         self.assertEqual(result, "formatted review")
 
     def test_memory_review_not_cli_only(self) -> None:
         """memory-review must be dispatchable from scheduled channel."""
-        with mock.patch("tars.brief.build_review_sections", return_value=[]):
-            with mock.patch("tars.brief.format_brief_text", return_value=""):
+        with mock.patch.object(_brief, "build_review_sections", return_value=[]):
+            with mock.patch.object(_brief, "format_brief_text", return_value=""):
                 result = dispatch("/memory-review", "claude", "sonnet", context={"channel": "scheduled"})
         self.assertNotIn("CLI", result or "")
 
@@ -545,16 +543,16 @@ class MemoryReviewDispatchTests(unittest.TestCase):
 
 
 class ReviewTidyToolLeakageTests(unittest.TestCase):
-    @mock.patch("tars.core.chat", return_value="- rule one\n- rule two")
-    @mock.patch("tars.memory.load_feedback", return_value=("## 2026 correction", "## 2026 reward"))
+    @mock.patch.object(_core, "chat", return_value="- rule one\n- rule two")
+    @mock.patch.object(_memory, "load_feedback", return_value=("## 2026 correction", "## 2026 reward"))
     def test_review_uses_no_tools(self, mock_fb, mock_chat) -> None:
         dispatch("/review", "claude", "sonnet", context={"channel": "cli"})
         mock_chat.assert_called_once()
         _, kwargs = mock_chat.call_args
         self.assertFalse(kwargs.get("use_tools", True))
 
-    @mock.patch("tars.core.chat", return_value="- [semantic] duplicate entry")
-    @mock.patch("tars.memory.load_memory_files", return_value={"semantic": "- fact", "procedural": ""})
+    @mock.patch.object(_core, "chat", return_value="- [semantic] duplicate entry")
+    @mock.patch.object(_memory, "load_memory_files", return_value={"semantic": "- fact", "procedural": ""})
     def test_tidy_uses_no_tools(self, mock_files, mock_chat) -> None:
         dispatch("/tidy", "claude", "sonnet", context={"channel": "cli"})
         mock_chat.assert_called_once()
@@ -599,9 +597,6 @@ class FormatErrorTests(unittest.TestCase):
 
 class SessionsDisplayTests(unittest.TestCase):
     def test_sessions_with_channel(self) -> None:
-        from tars.sessions import SessionInfo
-        from pathlib import Path
-
         mock_sessions = [
             SessionInfo(
                 path=Path("/tmp/s1.md"), date="2026-03-01 10:00",
@@ -614,17 +609,13 @@ class SessionsDisplayTests(unittest.TestCase):
                 channel="web",
             ),
         ]
-        with mock.patch("tars.sessions.list_sessions", return_value=mock_sessions):
-            from tars.commands import _dispatch_sessions
+        with mock.patch.object(_sess, "list_sessions", return_value=mock_sessions):
             result = _dispatch_sessions()
         self.assertIn("[cli]", result)
         self.assertIn("[web]", result)
         self.assertIn("Weather talk", result)
 
     def test_sessions_without_channel(self) -> None:
-        from tars.sessions import SessionInfo
-        from pathlib import Path
-
         mock_sessions = [
             SessionInfo(
                 path=Path("/tmp/s1.md"), date="2026-03-01 10:00",
@@ -632,8 +623,7 @@ class SessionsDisplayTests(unittest.TestCase):
                 channel="",
             ),
         ]
-        with mock.patch("tars.sessions.list_sessions", return_value=mock_sessions):
-            from tars.commands import _dispatch_sessions
+        with mock.patch.object(_sess, "list_sessions", return_value=mock_sessions):
             result = _dispatch_sessions()
         self.assertNotIn("[", result)
         self.assertIn("Old session", result)
@@ -1,27 +1,10 @@
+import copy
 import sys
-import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("openai", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
-
-# Ensure the anthropic mock has real exception classes for fallback tests.
-# (the mock may have been created by another test file loaded first)
-_APIStatusError = type("APIStatusError", (Exception,), {"status_code": 0})
-sys.modules["anthropic"].APIStatusError = _APIStatusError
-sys.modules["anthropic"].RateLimitError = type("RateLimitError", (_APIStatusError,), {"status_code": 429})
-sys.modules["anthropic"].BadRequestError = type("BadRequestError", (_APIStatusError,), {"status_code": 400})
-sys.modules["anthropic"].APIConnectionError = type("APIConnectionError", (Exception,), {})
-sys.modules["anthropic"].APITimeoutError = type("APITimeoutError", (Exception,), {})
-
-_OAIAPIStatusError = type("APIStatusError", (Exception,), {"status_code": 0})
-sys.modules["openai"].APIStatusError = _OAIAPIStatusError
-sys.modules["openai"].APIConnectionError = type("APIConnectionError", (Exception,), {})
-sys.modules["openai"].APITimeoutError = type("APITimeoutError", (Exception,), {})
+from tests._stubs import swap_attr
 
 from tars import conversation
 from tars.conversation import (
@@ -34,251 +17,231 @@ from tars.conversation import (
 )
 from tars.router import RouteResult
 
+_ANTHROPIC = sys.modules["anthropic"]
+_OPENAI = sys.modules["openai"]
+_PROVIDER_ERRORS = (
+    _ANTHROPIC.APIStatusError, _ANTHROPIC.APIConnectionError, _ANTHROPIC.APITimeoutError,
+    _OPENAI.APIStatusError, _OPENAI.APIConnectionError, _OPENAI.APITimeoutError,
+)
+
+
+def _returns(value):
+    return lambda *args, **kwargs: value
+
+
+class _ConversationFixture:
+    """Gives each test a fresh shallow copy of a per-class prototype Conversation."""
+
+    conv_kwargs = {"id": "test", "provider": "ollama", "model": "fake"}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls._conv_proto = Conversation(**cls.conv_kwargs)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.conv = copy.copy(self._conv_proto)
+        self.conv.messages = []
+
+    def _start_patch(self, name: str, **kwargs) -> mock.Mock:
+        """Patch a tars.conversation attribute for the rest of this test."""
+        patcher = mock.patch.object(conversation, name, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+
+class ProcessMessageTests(_ConversationFixture, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.chat = self._start_patch("chat", return_value="ok")
+        self.search = self._start_patch("_search_relevant_context", return_value="")
+        self.summarize = self._start_patch("_summarize_session", return_value="summary")
+        self.save = self._start_patch("_save_session")
 
-class ProcessMessageTests(unittest.TestCase):
     def test_appends_messages_and_returns_reply(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        with mock.patch.object(conversation, "chat", return_value="hi there"):
-            reply = process_message(conv, "hello")
+        self.chat.return_value = "hi there"
+        reply = process_message(self.conv, "hello")
         self.assertEqual(reply, "hi there")
-        self.assertEqual(len(conv.messages), 2)
-        self.assertEqual(conv.messages[0], {"role": "user", "content": "hello"})
-        self.assertEqual(conv.messages[1], {"role": "assistant", "content": "hi there"})
-        self.assertEqual(conv.msg_count, 1)
+        self.assertEqual(len(self.conv.messages), 2)
+        self.assertEqual(self.conv.messages[0], {"role": "user", "content": "hello"})
+        self.assertEqual(self.conv.messages[1], {"role": "assistant", "content": "hi there"})
+        self.assertEqual(self.conv.msg_count, 1)
 
     def test_first_message_triggers_search(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        with (
-            mock.patch.object(conversation, "chat", return_value="ok"),
-            mock.patch.object(conversation, "_search_relevant_context", return_value="ctx") as search,
-        ):
-            process_message(conv, "hello")
-        search.assert_called_once_with("hello")
-        self.assertEqual(conv.search_context, "ctx")
+        self.search.return_value = "ctx"
+        process_message(self.conv, "hello")
+        self.search.assert_called_once_with("hello")
+        self.assertEqual(self.conv.search_context, "ctx")
 
     def test_second_message_skips_search(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        conv.messages.append({"role": "user", "content": "first"})
-        conv.search_context = "already set"
-        with (
-            mock.patch.object(conversation, "chat", return_value="ok"),
-            mock.patch.object(conversation, "_search_relevant_context") as search,
-        ):
-            process_message(conv, "second")
-        search.assert_not_called()
+        self.conv.messages.append({"role": "user", "content": "first"})
+        self.conv.search_context = "already set"
+        process_message(self.conv, "second")
+        self.search.assert_not_called()
 
     def test_compaction_triggers_at_interval(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            session_file = Path(tmpdir) / "session.md"
-            with (
-                mock.patch.object(conversation, "SESSION_COMPACTION_INTERVAL", 2),
-                mock.patch.object(conversation, "chat", return_value="ok"),
-                mock.patch.object(conversation, "_summarize_session", return_value="summary") as summarize,
-                mock.patch.object(conversation, "_save_session") as save,
-            ):
-                process_message(conv, "msg 1", session_file)
-                self.assertEqual(summarize.call_count, 0)
-                process_message(conv, "msg 2", session_file)
-                self.assertEqual(summarize.call_count, 1)
-            save.assert_called_once()
-            self.assertTrue(save.call_args.kwargs.get("is_compaction"))
-
-
-class LastModelTrackingTests(unittest.TestCase):
+        session_file = Path("/nonexistent/session.md")
+        with mock.patch.object(conversation, "SESSION_COMPACTION_INTERVAL", 2):
+            process_message(self.conv, "msg 1", session_file)
+            self.assertEqual(self.summarize.call_count, 0)
+            process_message(self.conv, "msg 2", session_file)
+            self.assertEqual(self.summarize.call_count, 1)
+        self.save.assert_called_once()
+        self.assertTrue(self.save.call_args.kwargs.get("is_compaction"))
+
+
+class LastModelTrackingTests(_ConversationFixture, unittest.TestCase):
+    conv_kwargs = {"id": "test", "provider": "ollama", "model": "llama3.1:8b"}
+
     def test_process_message_sets_last_provider_model(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(conversation, "chat", return_value="ok"),
+            swap_attr(conversation, "route_message", _returns(RouteResult("claude", "sonnet"))),
+            swap_attr(conversation, "chat", _returns("ok")),
         ):
-            process_message(conv, "hello")
-        self.assertEqual(conv.last_provider, "claude")
-        self.assertEqual(conv.last_model, "sonnet")
+            process_message(self.conv, "hello")
+        self.assertEqual(self.conv.last_provider, "claude")
+        self.assertEqual(self.conv.last_model, "sonnet")
 
     def test_process_message_fallback_sets_default_model(self) -> None:
-        _anthropic = sys.modules["anthropic"]
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-        err = _anthropic.RateLimitError("error")
+        err = _ANTHROPIC.RateLimitError("error")
         with (
             mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
             mock.patch.object(conversation, "chat", side_effect=[err, "fallback"]),
         ):
-            process_message(conv, "hello")
-        self.assertEqual(conv.last_provider, "ollama")
-        self.assertEqual(conv.last_model, "llama3.1:8b")
+            process_message(self.conv, "hello")
+        self.assertEqual(self.conv.last_provider, "ollama")
+        self.assertEqual(self.conv.last_model, "llama3.1:8b")
 
     def test_process_message_stream_sets_last_provider_model(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("ollama", "llama3.1:8b")),
-            mock.patch.object(conversation, "chat_stream", return_value=iter(["ok"])),
+            swap_attr(conversation, "route_message", _returns(RouteResult("ollama", "llama3.1:8b"))),
+            swap_attr(conversation, "chat_stream", lambda *args, **kwargs: iter(["ok"])),
         ):
-            list(process_message_stream(conv, "hello"))
-        self.assertEqual(conv.last_provider, "ollama")
-        self.assertEqual(conv.last_model, "llama3.1:8b")
+            list(process_message_stream(self.conv, "hello"))
+        self.assertEqual(self.conv.last_provider, "ollama")
+        self.assertEqual(self.conv.last_model, "llama3.1:8b")
 
     def test_stream_escalated_sets_provider_model(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(conversation, "chat", return_value="buffered"),
+            swap_attr(conversation, "route_message", _returns(RouteResult("claude", "sonnet"))),
+            swap_attr(conversation, "chat", _returns("buffered")),
         ):
-            list(process_message_stream(conv, "hello"))
-        self.assertEqual(conv.last_provider, "claude")
-        self.assertEqual(conv.last_model, "sonnet")
+            list(process_message_stream(self.conv, "hello"))
+        self.assertEqual(self.conv.last_provider, "claude")
+        self.assertEqual(self.conv.last_model, "sonnet")
+
 
+class ProcessMessageStreamTests(_ConversationFixture, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.chat_stream = self._start_patch("chat_stream", return_value=iter(["ok"]))
+        self.search = self._start_patch("_search_relevant_context", return_value="")
 
-class ProcessMessageStreamTests(unittest.TestCase):
     def test_yields_deltas(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        with mock.patch.object(conversation, "chat_stream", return_value=iter(["hel", "lo ", "world"])):
-            deltas = list(process_message_stream(conv, "hi"))
+        self.chat_stream.return_value = iter(["hel", "lo ", "world"])
+        deltas = list(process_message_stream(self.conv, "hi"))
         self.assertEqual(deltas, ["hel", "lo ", "world"])
 
     def test_builds_full_reply_in_messages(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        with mock.patch.object(conversation, "chat_stream", return_value=iter(["one", "two"])):
-            list(process_message_stream(conv, "hi"))
-        self.assertEqual(conv.messages[-1], {"role": "assistant", "content": "onetwo"})
-        self.assertEqual(conv.msg_count, 1)
+        self.chat_stream.return_value = iter(["one", "two"])
+        list(process_message_stream(self.conv, "hi"))
+        self.assertEqual(self.conv.messages[-1], {"role": "assistant", "content": "onetwo"})
+        self.assertEqual(self.conv.msg_count, 1)
 
     def test_first_message_triggers_search(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        with (
-            mock.patch.object(conversation, "chat_stream", return_value=iter(["ok"])),
-            mock.patch.object(conversation, "_search_relevant_context", return_value="ctx") as search,
-        ):
-            list(process_message_stream(conv, "hello"))
-        search.assert_called_once_with("hello")
-        self.assertEqual(conv.search_context, "ctx")
+        self.search.return_value = "ctx"
+        list(process_message_stream(self.conv, "hello"))
+        self.search.assert_called_once_with("hello")
+        self.assertEqual(self.conv.search_context, "ctx")
 
 
-class EscalationFallbackTests(unittest.TestCase):
+class EscalationFallbackTests(_ConversationFixture, unittest.TestCase):
+    conv_kwargs = {"id": "test", "provider": "ollama", "model": "llama3.1:8b"}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls._APIStatusError = _ANTHROPIC.APIStatusError
+        cls._error_classes = {
+            "RateLimitError": _ANTHROPIC.RateLimitError,
+            "BadRequestError": _ANTHROPIC.BadRequestError,
+        }
+
     def setUp(self) -> None:
-        conversation._PROVIDER_ERRORS = (
-            sys.modules["anthropic"].APIStatusError,
-            sys.modules["anthropic"].APIConnectionError,
-            sys.modules["anthropic"].APITimeoutError,
-            sys.modules["openai"].APIStatusError,
-            sys.modules["openai"].APIConnectionError,
-            sys.modules["openai"].APITimeoutError,
-        )
+        super().setUp()
+        conversation._PROVIDER_ERRORS = _PROVIDER_ERRORS
 
     def _api_error(self, cls_name: str = "RateLimitError"):
-        _anthropic = sys.modules["anthropic"]
-        return getattr(_anthropic, cls_name)("error")
+        return self._error_classes[cls_name]("error")
+
+    def _patch_calls(self, route: RouteResult):
+        """Patch routing and both chat entry points in a single patch.multiple."""
+        patcher = mock.patch.multiple(
+            conversation, route_message=mock.DEFAULT, chat=mock.DEFAULT, chat_stream=mock.DEFAULT,
+        )
+        mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+        mocks["route_message"].return_value = route
+        return mocks
 
     def test_rate_limit_falls_back_to_default(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(
-                conversation, "chat",
-                side_effect=[self._api_error("RateLimitError"), "fallback reply"],
-            ) as chat_mock,
-        ):
-            reply = process_message(conv, "add task buy milk")
+        mocks = self._patch_calls(RouteResult("claude", "sonnet"))
+        mocks["chat"].side_effect = [self._api_error("RateLimitError"), "fallback reply"]
+        reply = process_message(self.conv, "add task buy milk")
         self.assertEqual(reply, "fallback reply")
-        self.assertEqual(chat_mock.call_count, 2)
-        args = chat_mock.call_args_list[1][0]
+        self.assertEqual(mocks["chat"].call_count, 2)
+        args = mocks["chat"].call_args_list[1][0]
         self.assertEqual(args[1], "ollama")
         self.assertEqual(args[2], "llama3.1:8b")
 
     def test_bad_request_does_not_fall_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(
-                conversation, "chat",
-                side_effect=self._api_error("BadRequestError"),
-            ),
-        ):
-            _anthropic = sys.modules["anthropic"]
-            with self.assertRaises(_anthropic.APIStatusError):
-                process_message(conv, "what's the weather")
+        mocks = self._patch_calls(RouteResult("claude", "sonnet"))
+        mocks["chat"].side_effect = self._api_error("BadRequestError")
+        with self.assertRaises(self._APIStatusError):
+            process_message(self.conv, "what's the weather")
 
     def test_api_error_reraises_when_not_escalated(self) -> None:
-        _anthropic = sys.modules["anthropic"]
         conv = Conversation(id="test", provider="claude", model="sonnet")
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(
-                conversation, "chat",
-                side_effect=self._api_error("BadRequestError"),
-            ),
-        ):
-            with self.assertRaises(_anthropic.APIStatusError):
-                process_message(conv, "hello")
+        mocks = self._patch_calls(RouteResult("claude", "sonnet"))
+        mocks["chat"].side_effect = self._api_error("BadRequestError")
+        with self.assertRaises(self._APIStatusError):
+            process_message(conv, "hello")
 
     def test_stream_rate_limit_falls_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-        err = self._api_error("RateLimitError")
-
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(conversation, "chat", side_effect=err),
-            mock.patch.object(conversation, "chat_stream", return_value=iter(["fall", "back"])),
-        ):
-            deltas = list(process_message_stream(conv, "what's the weather"))
+        """Escalated failure falls back cleanly — no partial output before fallback."""
+        mocks = self._patch_calls(RouteResult("claude", "sonnet"))
+        mocks["chat"].side_effect = self._api_error("RateLimitError")
+        mocks["chat_stream"].return_value = iter(["fall", "back"])
+        deltas = list(process_message_stream(self.conv, "what's the weather"))
         self.assertEqual(deltas, ["fall", "back"])
-        self.assertEqual(conv.messages[-1], {"role": "assistant", "content": "fallback"})
+        self.assertNotIn("buffered response", deltas)
+        self.assertEqual(self.conv.messages[-1], {"role": "assistant", "content": "fallback"})
 
     def test_escalated_uses_chat_not_stream(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
+        mocks = self._patch_calls(RouteResult("claude", "sonnet"))
+        mocks["chat"].return_value = "buffered response"
+        deltas = list(process_message_stream(self.conv, "what's the weather"))
 
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(conversation, "chat", return_value="buffered response") as mock_chat,
-            mock.patch.object(conversation, "chat_stream") as mock_stream,
-        ):
-            deltas = list(process_message_stream(conv, "what's the weather"))
-
-        mock_chat.assert_called_once()
-        mock_stream.assert_not_called()
+        mocks["chat"].assert_called_once()
+        mocks["chat_stream"].assert_not_called()
         self.assertEqual(deltas, ["buffered response"])
-        self.assertEqual(conv.messages[-1]["content"], "buffered response")
-
-    def test_stream_fallback_yields_single_response(self) -> None:
-        """Escalated failure falls back cleanly — no partial output before fallback."""
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-        err = self._api_error("RateLimitError")
-
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(conversation, "chat", side_effect=err),
-            mock.patch.object(conversation, "chat_stream", return_value=iter(["fall", "back"])),
-        ):
-            deltas = list(process_message_stream(conv, "what's the weather"))
-
-        self.assertEqual(deltas, ["fall", "back"])
-        self.assertNotIn("buffered response", deltas)
+        self.assertEqual(self.conv.messages[-1]["content"], "buffered response")
 
     def test_non_escalated_uses_stream_not_chat(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("ollama", "llama3.1:8b")),
-            mock.patch.object(conversation, "chat") as mock_chat,
-            mock.patch.object(conversation, "chat_stream", return_value=iter(["streamed"])) as mock_stream,
-        ):
-            deltas = list(process_message_stream(conv, "hello"))
+        mocks = self._patch_calls(RouteResult("ollama", "llama3.1:8b"))
+        mocks["chat_stream"].return_value = iter(["streamed"])
+        deltas = list(process_message_stream(self.conv, "hello"))
 
-        mock_stream.assert_called_once()
-        mock_chat.assert_not_called()
+        mocks["chat_stream"].assert_called_once()
+        mocks["chat"].assert_not_called()
         self.assertEqual(deltas, ["streamed"])
 
     def test_stream_bad_request_does_not_fall_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
-        err = self._api_error("BadRequestError")
-
-        with (
-            mock.patch.object(conversation, "route_message", return_value=RouteResult("claude", "sonnet")),
-            mock.patch.object(conversation, "chat", side_effect=err),
-        ):
-            _anthropic = sys.modules["anthropic"]
-            with self.assertRaises(_anthropic.APIStatusError):
-                list(process_message_stream(conv, "what's the weather"))
+        mocks = self._patch_calls(RouteResult("claude", "sonnet"))
+        mocks["chat"].side_effect = self._api_error("BadRequestError")
+        with self.assertRaises(self._APIStatusError):
+            list(process_message_stream(self.conv, "what's the weather"))
 
 
 class SanitizeFactTests(unittest.TestCase):
@@ -312,60 +275,52 @@ class SanitizeFactTests(unittest.TestCase):
         self.assertEqual(result, "user prefers dark mode")
 
 
-class SaveSessionTests(unittest.TestCase):
+class SaveSessionTests(_ConversationFixture, unittest.TestCase):
     def test_saves_final_summary(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        conv.messages = [{"role": "user", "content": "hi"}]
-        conv.msg_count = 1
+        self.conv.messages = [{"role": "user", "content": "hi"}]
+        self.conv.msg_count = 1
         with (
             mock.patch.object(conversation, "_summarize_session", return_value="final") as summarize,
             mock.patch.object(conversation, "_save_session") as save,
         ):
-            save_session(conv, Path("/tmp/session.md"))
+            save_session(self.conv, Path("/tmp/session.md"))
         summarize.assert_called_once()
         save.assert_called_once()
         self.assertFalse(save.call_args.kwargs.get("is_compaction", False))
 
     def test_skips_when_no_new_messages(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        conv.msg_count = 5
-        conv.last_compaction = 5
+        self.conv.msg_count = 5
+        self.conv.last_compaction = 5
         with mock.patch.object(conversation, "_summarize_session") as summarize:
-            save_session(conv, Path("/tmp/session.md"))
+            save_session(self.conv, Path("/tmp/session.md"))
         summarize.assert_not_called()
 
     def test_skips_when_no_session_file(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="fake")
-        conv.messages = [{"role": "user", "content": "hi"}]
-        conv.msg_count = 1
+        self.conv.messages = [{"role": "user", "content": "hi"}]
+        self.conv.msg_count = 1
         with mock.patch.object(conversation, "_summarize_session") as summarize:
-            save_session(conv, None)
+            save_session(self.conv, None)
         summarize.assert_not_called()
 
 
-class OpenAIEscalationFallbackTests(unittest.TestCase):
+class OpenAIEscalationFallbackTests(_ConversationFixture, unittest.TestCase):
+    conv_kwargs = {"id": "test", "provider": "ollama", "model": "llama3.1:8b"}
+
     def setUp(self) -> None:
-        conversation._PROVIDER_ERRORS = (
-            sys.modules["anthropic"].APIStatusError,
-            sys.modules["anthropic"].APIConnectionError,
-            sys.modules["anthropic"].APITimeoutError,
-            sys.modules["openai"].APIStatusError,
-            sys.modules["openai"].APIConnectionError,
-            sys.modules["openai"].APITimeoutError,
-        )
+        super().setUp()
+        conversation._PROVIDER_ERRORS = _PROVIDER_ERRORS
 
     def _oai_error(self, status_code: int):
-        cls = type("OAIStatusError", (sys.modules["openai"].APIStatusError,), {"status_code": status_code})
+        cls = type("OAIStatusError", (_OPENAI.APIStatusError,), {"status_code": status_code})
         return cls("error")
 
     def _oai_connection_error(self):
-        return sys.modules["openai"].APIConnectionError("error")
+        return _OPENAI.APIConnectionError("error")
 
     def _oai_timeout_error(self):
-        return sys.modules["openai"].APITimeoutError("error")
+        return _OPENAI.APITimeoutError("error")
 
     def test_openai_rate_limit_falls_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
             mock.patch.object(conversation, "route_message", return_value=RouteResult("openai", "qwen3.5")),
             mock.patch.object(
@@ -373,12 +328,11 @@ class OpenAIEscalationFallbackTests(unittest.TestCase):
                 side_effect=[self._oai_error(429), "fallback reply"],
             ) as chat_mock,
         ):
-            reply = process_message(conv, "hello")
+            reply = process_message(self.conv, "hello")
         self.assertEqual(reply, "fallback reply")
         self.assertEqual(chat_mock.call_count, 2)
 
     def test_openai_connection_error_falls_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
             mock.patch.object(conversation, "route_message", return_value=RouteResult("openai", "qwen3.5")),
             mock.patch.object(
@@ -386,11 +340,10 @@ class OpenAIEscalationFallbackTests(unittest.TestCase):
                 side_effect=[self._oai_connection_error(), "fallback reply"],
             ),
         ):
-            reply = process_message(conv, "hello")
+            reply = process_message(self.conv, "hello")
         self.assertEqual(reply, "fallback reply")
 
     def test_openai_timeout_falls_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
             mock.patch.object(conversation, "route_message", return_value=RouteResult("openai", "qwen3.5")),
             mock.patch.object(
@@ -398,11 +351,10 @@ class OpenAIEscalationFallbackTests(unittest.TestCase):
                 side_effect=[self._oai_timeout_error(), "fallback reply"],
             ),
         ):
-            reply = process_message(conv, "hello")
+            reply = process_message(self.conv, "hello")
         self.assertEqual(reply, "fallback reply")
 
     def test_openai_bad_request_does_not_fall_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
             mock.patch.object(conversation, "route_message", return_value=RouteResult("openai", "qwen3.5")),
             mock.patch.object(
@@ -410,89 +362,82 @@ class OpenAIEscalationFallbackTests(unittest.TestCase):
                 side_effect=self._oai_error(400),
             ),
         ):
-            _openai = sys.modules["openai"]
-            with self.assertRaises(_openai.APIStatusError):
-                process_message(conv, "hello")
+            with self.assertRaises(_OPENAI.APIStatusError):
+                process_message(self.conv, "hello")
 
     def test_stream_openai_rate_limit_falls_back(self) -> None:
-        conv = Conversation(id="test", provider="ollama", model="llama3.1:8b")
         with (
             mock.patch.object(conversation, "route_message", return_value=RouteResult("openai", "qwen3.5")),
             mock.patch.object(conversation, "chat", side_effect=self._oai_error(429)),
             mock.patch.object(conversation, "chat_stream", return_value=iter(["fall", "back"])),
         ):
-            deltas = list(process_message_stream(conv, "hello"))
+            deltas = list(process_message_stream(self.conv, "hello"))
         self.assertEqual(deltas, ["fall", "back"])
 
 
-class EffectiveSearchContextTests(unittest.TestCase):
+class EffectiveSearchContextTests(_ConversationFixture, unittest.TestCase):
+    conv_kwargs = {"id": "t", "provider": "ollama", "model": "m"}
+
     def test_both_present(self) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        conv.daily_brief = "[tasks]\nBuy milk"
-        conv.search_context = "some search results"
-        result = _effective_search_context(conv)
+        self.conv.daily_brief = "[tasks]\nBuy milk"
+        self.conv.search_context = "some search results"
+        result = _effective_search_context(self.conv)
         self.assertIn("[tasks]", result)
         self.assertIn("some search results", result)
 
     def test_only_brief(self) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        conv.daily_brief = "[tasks]\nBuy milk"
-        result = _effective_search_context(conv)
+        self.conv.daily_brief = "[tasks]\nBuy milk"
+        result = _effective_search_context(self.conv)
         self.assertEqual(result, "[tasks]\nBuy milk")
 
     def test_only_search(self) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        conv.search_context = "search results"
-        result = _effective_search_context(conv)
+        self.conv.search_context = "search results"
+        result = _effective_search_context(self.conv)
         self.assertEqual(result, "search results")
 
     def test_neither(self) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        result = _effective_search_context(conv)
+        result = _effective_search_context(self.conv)
         self.assertEqual(result, "")
 
 
-class FetchDailyBriefTests(unittest.TestCase):
+class FetchDailyBriefTests(_ConversationFixture, unittest.TestCase):
+    conv_kwargs = {"id": "t", "provider": "ollama", "model": "m"}
+
     @mock.patch("tars.conversation.build_daily_context", return_value="[tasks]\nStuff")
     def test_stores_on_conv(self, mock_ctx) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        _fetch_daily_brief(conv)
-        self.assertEqual(conv.daily_brief, "[tasks]\nStuff")
+        _fetch_daily_brief(self.conv)
+        self.assertEqual(self.conv.daily_brief, "[tasks]\nStuff")
 
     @mock.patch("tars.conversation.build_daily_context", side_effect=Exception("boom"))
     def test_swallows_errors(self, mock_ctx) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        _fetch_daily_brief(conv)
-        self.assertEqual(conv.daily_brief, "")
+        _fetch_daily_brief(self.conv)
+        self.assertEqual(self.conv.daily_brief, "")
 
     @mock.patch("tars.conversation.build_daily_context", return_value="[tasks]\nDo things")
     def test_process_message_fetches_on_first(self, mock_ctx) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
         with (
-            mock.patch.object(conversation, "chat", return_value="ok"),
-            mock.patch.object(conversation, "_search_relevant_context", return_value=""),
+            swap_attr(conversation, "chat", _returns("ok")),
+            swap_attr(conversation, "_search_relevant_context", _returns("")),
         ):
-            process_message(conv, "hello")
+            process_message(self.conv, "hello")
         mock_ctx.assert_called_once()
-        self.assertEqual(conv.daily_brief, "[tasks]\nDo things")
+        self.assertEqual(self.conv.daily_brief, "[tasks]\nDo things")
 
     @mock.patch("tars.conversation.build_daily_context", return_value="[tasks]\nDo things")
     def test_not_fetched_on_second_message(self, mock_ctx) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
         with (
-            mock.patch.object(conversation, "chat", return_value="ok"),
-            mock.patch.object(conversation, "_search_relevant_context", return_value=""),
+            swap_attr(conversation, "chat", _returns("ok")),
+            swap_attr(conversation, "_search_relevant_context", _returns("")),
         ):
-            process_message(conv, "hello")
-            process_message(conv, "again")
+            process_message(self.conv, "hello")
+            process_message(self.conv, "again")
         mock_ctx.assert_called_once()
 
     @mock.patch("tars.conversation.build_daily_context", return_value="[tasks]\nDo things")
     def test_skipped_when_search_context_preset(self, mock_ctx) -> None:
-        conv = Conversation(id="t", provider="ollama", model="m")
-        conv.search_context = "[one-shot]"
-        with mock.patch.object(conversation, "chat", return_value="ok"):
-            process_message(conv, "hello")
+        self.conv.search_context = "[one-shot]"
+        with swap_attr(conversation, "chat", _returns("ok")):
+            process_message(self.conv, "hello")
         mock_ctx.assert_not_called()
 
 
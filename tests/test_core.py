@@ -1,12 +1,8 @@
 import os
-import sys
 import unittest
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("openai", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars import core
 from tars.search import SearchResult
@@ -51,10 +47,13 @@ class ChatRoutingTests(unittest.TestCase):
         m.assert_called_once_with([], "m", search_context="ctx", use_tools=True, tool_hints=None)
 
 
+_ROUTING_CONFIDENCE_PHRASES = ("ambiguous", "clarifying question")
+
+
 class SystemPromptContentTests(unittest.TestCase):
     def test_prompt_contains_routing_confidence(self) -> None:
-        self.assertIn("ambiguous", core.SYSTEM_PROMPT)
-        self.assertIn("clarifying question", core.SYSTEM_PROMPT)
+        missing = [p for p in _ROUTING_CONFIDENCE_PHRASES if p not in core.SYSTEM_PROMPT]
+        self.assertEqual(missing, [], f"SYSTEM_PROMPT is missing {missing}")
 
     def test_prompt_no_blanket_must_call(self) -> None:
         self.assertNotIn("You MUST call", core.SYSTEM_PROMPT)
@@ -1,11 +1,7 @@
-import sys
 import unittest
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("openai", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars import core
 
@@ -1,14 +1,11 @@
 """Tests for the debug module."""
 
 import os
-import sys
 import unittest
 from io import StringIO
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars import debug
 
@@ -2,21 +2,19 @@
 
 import email
 import os
-import sys
 import unittest
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from unittest import mock
 
-# Ensure ollama mock is in place before importing tars modules
-if "ollama" not in sys.modules:
-    sys.modules["ollama"] = mock.Mock()
+import tests._stubs  # noqa: F401
 
 from tars.email import (
     _email_config,
     _extract_body,
     _fetch_unseen,
     _is_allowed_sender,
+    _send_reply,
     _strip_html,
     _thread_id,
 )
@@ -38,6 +36,23 @@ class TestExtractBody(unittest.TestCase):
         msg.attach(MIMEText("<b>HTML only</b>", "html", "utf-8"))
         self.assertEqual(_extract_body(msg), "HTML only")
 
+    def test_empty_plain_falls_back_to_later_html(self):
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText("", "plain", "utf-8"))
+        msg.attach(MIMEText("<p>HTML after</p>", "html", "utf-8"))
+        self.assertEqual(_extract_body(msg), "HTML after")
+
+    def test_empty_first_plain_ends_plain_search(self):
+        # A later inline text/plain (e.g. a list footer) must not win over
+        # the html alternative of an empty first plain part.
+        alt = MIMEMultipart("alternative")
+        alt.attach(MIMEText("", "plain", "utf-8"))
+        alt.attach(MIMEText("<p>The real message</p>", "html", "utf-8"))
+        msg = MIMEMultipart("mixed")
+        msg.attach(alt)
+        msg.attach(MIMEText("-- list footer", "plain", "utf-8"))
+        self.assertEqual(_extract_body(msg), "The real message")
+
     def test_strips_quoted_replies(self):
         body = "My new message\n> Previous reply\n> More quoted\nAnother line"
         msg = MIMEText(body, "plain", "utf-8")
@@ -86,6 +101,15 @@ class TestThreadId(unittest.TestCase):
         msg["References"] = "<root@example.com>"
         self.assertEqual(_thread_id(msg), "<root@example.com>")
 
+    def test_folded_references(self):
+        raw = (
+            b"Message-ID: <msg3@example.com>\r\n"
+            b"References: <root@example.com>\r\n <msg1@example.com>\r\n"
+            b"\r\nbody\r\n"
+        )
+        msg = email.message_from_bytes(raw)
+        self.assertEqual(_thread_id(msg), "<root@example.com>")
+
 
 class TestSenderFilter(unittest.TestCase):
     def test_allowed(self):
@@ -108,18 +132,24 @@ class TestSenderFilter(unittest.TestCase):
         msg["From"] = "bill@example.com"
         self.assertTrue(_is_allowed_sender(msg, ["bill@example.com"]))
 
+    def test_accepts_frozenset(self):
+        msg = MIMEText("test", "plain")
+        msg["From"] = "Bill <Bill@Example.COM>"
+        self.assertTrue(_is_allowed_sender(msg, frozenset({"bill@example.com"})))
+
 
 class TestSendReplyHeaders(unittest.TestCase):
     """Test that _send_reply constructs correct headers (without actually sending)."""
 
-    @mock.patch("tars.email.smtplib.SMTP")
-    def test_reply_headers(self, mock_smtp_class):
-        from tars.email import _send_reply
-
-        mock_smtp = mock.MagicMock()
-        mock_smtp_class.return_value.__enter__ = mock.Mock(return_value=mock_smtp)
+    def setUp(self) -> None:
+        patcher = mock.patch("tars.email.smtplib.SMTP")
+        mock_smtp_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_smtp = mock.MagicMock()
+        mock_smtp_class.return_value.__enter__ = mock.Mock(return_value=self.mock_smtp)
         mock_smtp_class.return_value.__exit__ = mock.Mock(return_value=False)
 
+    def test_reply_headers(self):
         original = MIMEText("question", "plain")
         original["From"] = "bill@example.com"
         original["Message-ID"] = "<orig123@example.com>"
@@ -133,21 +163,14 @@ class TestSendReplyHeaders(unittest.TestCase):
         _send_reply(config, original, "Here is my reply")
 
         # Verify send_message was called
-        mock_smtp.send_message.assert_called_once()
-        sent = mock_smtp.send_message.call_args[0][0]
+        self.mock_smtp.send_message.assert_called_once()
+        sent = self.mock_smtp.send_message.call_args[0][0]
         self.assertEqual(sent["In-Reply-To"], "<orig123@example.com>")
         self.assertEqual(sent["References"], "<orig123@example.com>")
         self.assertEqual(sent["Subject"], "Re: Hello tars")
         self.assertEqual(sent["To"], "bill@example.com")
 
-    @mock.patch("tars.email.smtplib.SMTP")
-    def test_reply_preserves_re_subject(self, mock_smtp_class):
-        from tars.email import _send_reply
-
-        mock_smtp = mock.MagicMock()
-        mock_smtp_class.return_value.__enter__ = mock.Mock(return_value=mock_smtp)
-        mock_smtp_class.return_value.__exit__ = mock.Mock(return_value=False)
-
+    def test_reply_preserves_re_subject(self):
         original = MIMEText("follow up", "plain")
         original["From"] = "bill@example.com"
         original["Message-ID"] = "<orig456@example.com>"
@@ -161,7 +184,7 @@ class TestSendReplyHeaders(unittest.TestCase):
 
         _send_reply(config, original, "Reply again")
 
-        sent = mock_smtp.send_message.call_args[0][0]
+        sent = self.mock_smtp.send_message.call_args[0][0]
         self.assertEqual(sent["Subject"], "Re: Hello tars")
         self.assertEqual(
             sent["References"], "<root@example.com> <orig456@example.com>"
@@ -219,12 +242,17 @@ class TestEmailConfig(unittest.TestCase):
 
 
 class TestFetchUnseen(unittest.TestCase):
-    def _make_imap_mock(self, msg: email.message.Message) -> mock.Mock:
-        """Build an IMAP mock that returns a single message."""
+    def _make_imap_mock(self, *msgs: email.message.Message) -> mock.Mock:
+        """Build an IMAP mock whose UNSEEN search and FETCH return msgs as 1..n."""
         imap = mock.Mock()
-        imap.search.return_value = (None, [b"1"])
-        msg_bytes = msg.as_bytes()
-        imap.fetch.return_value = (None, [(b"header", msg_bytes)])
+        nums = [str(i).encode() for i in range(1, len(msgs) + 1)]
+        imap.search.return_value = (None, [b" ".join(nums)])
+        fetched = []
+        for num, msg in zip(nums, msgs):
+            msg_bytes = msg.as_bytes()
+            fetched.append((num + b" (BODY[] {%d}" % len(msg_bytes), msg_bytes))
+            fetched.append(b")")
+        imap.fetch.return_value = (None, fetched)
         return imap
 
     def test_disallowed_sender_marked_seen(self) -> None:
@@ -249,6 +277,21 @@ class TestFetchUnseen(unittest.TestCase):
         self.assertEqual(len(result), 1)
         imap.store.assert_not_called()
 
+    def test_batch_fetches_and_marks_seen_once(self) -> None:
+        allowed = MIMEText("hello", "plain")
+        allowed["From"] = "bill@example.com"
+        spam1 = MIMEText("spam", "plain")
+        spam1["From"] = "spammer@evil.com"
+        spam2 = MIMEText("spam", "plain")
+        spam2["From"] = "other@evil.com"
+
+        imap = self._make_imap_mock(spam1, allowed, spam2)
+        result = _fetch_unseen(imap, ["bill@example.com"])
+
+        imap.fetch.assert_called_once_with(b"1,2,3", "(BODY.PEEK[])")
+        self.assertEqual([num for num, _ in result], [b"2"])
+        imap.store.assert_called_once_with(b"1,3", "+FLAGS", "\\Seen")
+
 
 class TestEmailReliability(unittest.TestCase):
     """Test email processing reliability — retries, error handling, Seen flag."""
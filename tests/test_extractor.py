@@ -1,13 +1,10 @@
 import json
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars import conversation, extractor
 from tars.extractor import _parse_json_list, extract_facts
@@ -21,6 +18,26 @@ def _make_messages(user_count: int = 3) -> list[dict]:
     return msgs
 
 
+class _SpyChat:
+    """Stand-in for extractor.chat that records each call and returns no facts."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[list[dict], dict]] = []
+
+    def __call__(self, prompt_msgs, provider, model, **kwargs):
+        self.calls.append((prompt_msgs, kwargs))
+        return "[]"
+
+    @property
+    def prompt(self) -> str:
+        return self.calls[-1][0][0]["content"]
+
+
+# Shared by the extract_facts tests, which only read it. Tests that hand
+# messages to a Conversation build their own list.
+_MSGS_3 = _make_messages(3)
+
+
 class ParseJsonListTests(unittest.TestCase):
     def test_clean_json_array(self) -> None:
         self.assertEqual(_parse_json_list('["a", "b"]'), ["a", "b"])
@@ -56,13 +73,13 @@ class ParseJsonListTests(unittest.TestCase):
 
 class ExtractFactsTests(unittest.TestCase):
     def test_returns_parsed_facts(self) -> None:
-        msgs = _make_messages(3)
+        msgs = _MSGS_3
         with mock.patch.object(extractor, "chat", return_value='["fact one", "fact two"]'):
             result = extract_facts(msgs, "ollama", "fake")
         self.assertEqual(result, ["fact one", "fact two"])
 
     def test_skips_when_disabled(self) -> None:
-        msgs = _make_messages(3)
+        msgs = _MSGS_3
         with mock.patch.dict("os.environ", {"TARS_AUTO_EXTRACT": "false"}):
             result = extract_facts(msgs, "ollama", "fake")
         self.assertEqual(result, [])
@@ -75,19 +92,19 @@ class ExtractFactsTests(unittest.TestCase):
         chat_mock.assert_not_called()
 
     def test_model_error_returns_empty(self) -> None:
-        msgs = _make_messages(3)
+        msgs = _MSGS_3
         with mock.patch.object(extractor, "chat", side_effect=RuntimeError("model error")):
             result = extract_facts(msgs, "ollama", "fake")
         self.assertEqual(result, [])
 
     def test_invalid_json_returns_empty(self) -> None:
-        msgs = _make_messages(3)
+        msgs = _MSGS_3
         with mock.patch.object(extractor, "chat", return_value="no json here"):
             result = extract_facts(msgs, "ollama", "fake")
         self.assertEqual(result, [])
 
     def test_caps_at_five_facts(self) -> None:
-        msgs = _make_messages(3)
+        msgs = _MSGS_3
         facts = json.dumps([f"fact {i}" for i in range(10)])
         with mock.patch.object(extractor, "chat", return_value=facts):
             result = extract_facts(msgs, "ollama", "fake")
@@ -100,25 +117,18 @@ class ExtractFactsTests(unittest.TestCase):
             {"role": "user", "content": "msg 3"},
             {"role": "assistant", "content": "reply"},
         ]
-        captured_prompt = []
-
-        def capture_chat(prompt_msgs, provider, model, **kwargs):
-            captured_prompt.append(prompt_msgs[0]["content"])
-            return "[]"
-
-        with mock.patch.object(extractor, "chat", side_effect=capture_chat):
+        spy = _SpyChat()
+        with mock.patch.object(extractor, "chat", side_effect=spy):
             extract_facts(msgs, "ollama", "fake")
-        self.assertIn("&lt;script&gt;", captured_prompt[0])
+        self.assertIn("&lt;script&gt;", spy.prompt)
 
     def test_uses_no_tools(self) -> None:
-        msgs = _make_messages(3)
-
-        def capture_chat(prompt_msgs, provider, model, **kwargs):
-            self.assertFalse(kwargs.get("use_tools", True))
-            return "[]"
-
-        with mock.patch.object(extractor, "chat", side_effect=capture_chat):
+        msgs = _MSGS_3
+        spy = _SpyChat()
+        with mock.patch.object(extractor, "chat", side_effect=spy):
             extract_facts(msgs, "ollama", "fake")
+        _, kwargs = spy.calls[0]
+        self.assertFalse(kwargs.get("use_tools", True))
 
     def test_filters_system_and_tool_messages(self) -> None:
         msgs = [
@@ -129,16 +139,11 @@ class ExtractFactsTests(unittest.TestCase):
             {"role": "user", "content": "msg 3"},
             {"role": "assistant", "content": "reply"},
         ]
-        captured_prompt = []
-
-        def capture_chat(prompt_msgs, provider, model, **kwargs):
-            captured_prompt.append(prompt_msgs[0]["content"])
-            return "[]"
-
-        with mock.patch.object(extractor, "chat", side_effect=capture_chat):
+        spy = _SpyChat()
+        with mock.patch.object(extractor, "chat", side_effect=spy):
             extract_facts(msgs, "ollama", "fake")
-        self.assertNotIn("you are a bot", captured_prompt[0])
-        self.assertNotIn("tool result", captured_prompt[0])
+        self.assertNotIn("you are a bot", spy.prompt)
+        self.assertNotIn("tool result", spy.prompt)
 
     def test_empty_messages_returns_empty(self) -> None:
         result = extract_facts([], "ollama", "fake")
@@ -146,60 +151,55 @@ class ExtractFactsTests(unittest.TestCase):
 
 
 class ExtractionIntegrationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = self.enterContext(tempfile.TemporaryDirectory())
+        self.session_file = Path(self.tmpdir) / "session.md"
+        self.enterContext(mock.patch.dict("os.environ", {"TARS_MEMORY_DIR": self.tmpdir}))
+        patched = self.enterContext(mock.patch.multiple(
+            conversation,
+            _summarize_session=mock.DEFAULT,
+            _save_session=mock.DEFAULT,
+            extract_facts=mock.DEFAULT,
+        ))
+        patched["_summarize_session"].return_value = "summary"
+        self.save = patched["_save_session"]
+        self.extract_facts = patched["extract_facts"]
+        self.conv = conversation.Conversation(id="test", provider="ollama", model="fake")
+
+    def _daily_content(self) -> str:
+        parts = [
+            f.read_bytes()
+            for f in Path(self.tmpdir).iterdir()
+            if f.suffix == ".md" and f.name != "session.md"
+        ]
+        return b"".join(parts).decode("utf-8", errors="replace")
+
     def test_compaction_triggers_extraction(self) -> None:
-        conv = conversation.Conversation(id="test", provider="ollama", model="fake")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            session_file = Path(tmpdir) / "session.md"
-            with (
-                mock.patch.dict("os.environ", {"TARS_MEMORY_DIR": tmpdir}),
-                mock.patch.object(conversation, "SESSION_COMPACTION_INTERVAL", 2),
-                mock.patch.object(conversation, "chat", return_value="ok"),
-                mock.patch.object(conversation, "_summarize_session", return_value="summary"),
-                mock.patch.object(conversation, "_save_session"),
-                mock.patch.object(conversation, "extract_facts", return_value=["user prefers dark mode"]) as ef,
-            ):
-                conversation.process_message(conv, "msg 1", session_file)
-                conversation.process_message(conv, "msg 2", session_file)
-            ef.assert_called_once()
-            daily = list(Path(tmpdir).glob("*.md"))
-            daily_content = ""
-            for f in daily:
-                if f.name != "session.md":
-                    daily_content += f.read_text(encoding="utf-8", errors="replace")
-            self.assertIn("[extracted] user prefers dark mode", daily_content)
+        self.extract_facts.return_value = ["user prefers dark mode"]
+        with mock.patch.multiple(
+            conversation,
+            SESSION_COMPACTION_INTERVAL=2,
+            chat=mock.Mock(return_value="ok"),
+        ):
+            conversation.process_message(self.conv, "msg 1", self.session_file)
+            conversation.process_message(self.conv, "msg 2", self.session_file)
+        self.extract_facts.assert_called_once()
+        self.assertIn("[extracted] user prefers dark mode", self._daily_content())
 
     def test_save_session_triggers_extraction(self) -> None:
-        conv = conversation.Conversation(id="test", provider="ollama", model="fake")
-        conv.messages = _make_messages(3)
-        conv.msg_count = 3
-        with tempfile.TemporaryDirectory() as tmpdir:
-            session_file = Path(tmpdir) / "session.md"
-            with (
-                mock.patch.dict("os.environ", {"TARS_MEMORY_DIR": tmpdir}),
-                mock.patch.object(conversation, "_summarize_session", return_value="summary"),
-                mock.patch.object(conversation, "_save_session"),
-                mock.patch.object(conversation, "extract_facts", return_value=["uses vim keybindings"]) as ef,
-            ):
-                conversation.save_session(conv, session_file)
-            ef.assert_called_once()
-            daily = list(Path(tmpdir).glob("*.md"))
-            daily_content = ""
-            for f in daily:
-                if f.name != "session.md":
-                    daily_content += f.read_text(encoding="utf-8", errors="replace")
-            self.assertIn("[extracted] uses vim keybindings", daily_content)
+        self.extract_facts.return_value = ["uses vim keybindings"]
+        self.conv.messages = _make_messages(3)
+        self.conv.msg_count = 3
+        conversation.save_session(self.conv, self.session_file)
+        self.extract_facts.assert_called_once()
+        self.assertIn("[extracted] uses vim keybindings", self._daily_content())
 
     def test_extraction_failure_doesnt_break_save(self) -> None:
-        conv = conversation.Conversation(id="test", provider="ollama", model="fake")
-        conv.messages = [{"role": "user", "content": "hi"}]
-        conv.msg_count = 1
-        with (
-            mock.patch.object(conversation, "_summarize_session", return_value="summary"),
-            mock.patch.object(conversation, "_save_session") as save,
-            mock.patch.object(conversation, "extract_facts", side_effect=RuntimeError("boom")),
-        ):
-            conversation.save_session(conv, Path("/tmp/session.md"))
-        save.assert_called_once()
+        self.extract_facts.side_effect = RuntimeError("boom")
+        self.conv.messages = [{"role": "user", "content": "hi"}]
+        self.conv.msg_count = 1
+        conversation.save_session(self.conv, self.session_file)
+        self.save.assert_called_once()
 
 
 if __name__ == "__main__":
@@ -97,6 +97,9 @@ class WeatherForecastTests(unittest.TestCase):
         raw = json.dumps({"hourly": hours, "location": {"lat": 53.0, "lon": -6.0}})
         out = format_weather_forecast(raw)
         self.assertIn("00:00", out)
+        self.assertIn("21:00", out)
+        # Only every third hour is shown
+        self.assertNotIn("01:00", out)
         # Should have multiple lines
         self.assertGreater(len(out.splitlines()), 1)
 
@@ -1,13 +1,11 @@
+import functools
 import os
-import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
-sys.modules.setdefault("ollama", mock.MagicMock())
+from tests._stubs import set_env
 
 try:
     import sqlite_vec
@@ -16,6 +14,7 @@ except ImportError:
     _HAS_SQLITE_VEC = False
 
 from tars import db, embeddings
+from tars.chunker import chunk_markdown
 from tars.indexer import (
     _batched_embed,
     _discover_files,
@@ -34,6 +33,22 @@ def _fake_embed(**kwargs):
     return {"embeddings": [[0.1] * _DIM for _ in texts]}
 
 
+class _OllamaMockedTestCase(unittest.TestCase):
+    """Patches the ollama module inside tars.embeddings once per class.
+
+    Tests only consume _fake_embed's vectors and never assert on the mock's
+    call history, so one patch can serve every test in the class.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        patcher = mock.patch.object(embeddings, "ollama")
+        cls._mock_ollama = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        cls._mock_ollama.embed.side_effect = _fake_embed
+
+
 class ExtractWikilinksTests(unittest.TestCase):
     def test_basic(self) -> None:
         self.assertEqual(_extract_wikilinks("See [[Note]]"), ["Note"])
@@ -100,16 +115,7 @@ class DiscoverFilesTests(unittest.TestCase):
             self.assertEqual(result, [])
 
 
-class BuildIndexTests(unittest.TestCase):
-    def setUp(self) -> None:
-        # Patch the ollama module reference inside tars.embeddings directly
-        self._patcher = mock.patch.object(embeddings, "ollama")
-        self._mock_ollama = self._patcher.start()
-        self._mock_ollama.embed.side_effect = _fake_embed
-
-    def tearDown(self) -> None:
-        self._patcher.stop()
-
+class BuildIndexTests(_OllamaMockedTestCase):
     def test_no_memory_dir(self) -> None:
         with mock.patch.dict(os.environ, {}, clear=True):
             os.environ.pop("TARS_MEMORY_DIR", None)
@@ -124,7 +130,7 @@ class BuildIndexTests(unittest.TestCase):
             sessions.mkdir()
             (sessions / "log.md").write_text("# Session\n\nA session.\n", encoding="utf-8")
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats = build_index(model="test-model")
 
             self.assertEqual(stats["indexed"], 2)
@@ -136,7 +142,7 @@ class BuildIndexTests(unittest.TestCase):
             d = Path(td)
             (d / "Memory.md").write_text("# Memory\n\nFacts.\n", encoding="utf-8")
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats1 = build_index(model="test-model")
                 stats2 = build_index(model="test-model")
 
@@ -149,7 +155,7 @@ class BuildIndexTests(unittest.TestCase):
             d = Path(td)
             (d / "Memory.md").write_text("# Memory\n\nVersion 1.\n", encoding="utf-8")
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats1 = build_index(model="test-model")
                 self.assertEqual(stats1["indexed"], 1)
 
@@ -166,7 +172,7 @@ class BuildIndexTests(unittest.TestCase):
             d = Path(td)
             (d / "Memory.md").write_text("# Memory\n\nFacts.\n", encoding="utf-8")
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats1 = build_index(model="test-model")
                 self.assertEqual(stats1["indexed"], 1)
                 self.assertEqual(stats1["skipped"], 0)
@@ -184,7 +190,7 @@ class BuildIndexTests(unittest.TestCase):
             sessions.mkdir()
             (sessions / "log.md").write_text("# Session\n\nA session.\n", encoding="utf-8")
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats1 = build_index(model="test-model")
                 self.assertEqual(stats1["indexed"], 2)
 
@@ -201,7 +207,7 @@ class BuildIndexTests(unittest.TestCase):
             d = Path(td)
             (d / "Memory.md").write_text("# Memory\n\nFacts.\n", encoding="utf-8")
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 build_index(model="test-model")
 
                 (d / "Memory.md").write_text(
@@ -210,7 +216,8 @@ class BuildIndexTests(unittest.TestCase):
                 )
                 # Bad embeddings — _index_files catches the error per-file
                 with mock.patch("tars.indexer.embed", return_value=[]):
-                    stats_bad = build_index(model="test-model")
+                    with mock.patch("tars.indexer.time.sleep"):
+                        stats_bad = build_index(model="test-model")
                 self.assertEqual(stats_bad["indexed"], 0)
 
                 # Restore good embeddings — file should be reindexed, not skipped
@@ -263,15 +270,7 @@ class DiscoverVaultFilesTests(unittest.TestCase):
             self.assertEqual(result, [])
 
 
-class BuildNotesIndexTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self._patcher = mock.patch.object(embeddings, "ollama")
-        self._mock_ollama = self._patcher.start()
-        self._mock_ollama.embed.side_effect = _fake_embed
-
-    def tearDown(self) -> None:
-        self._patcher.stop()
-
+class BuildNotesIndexTests(_OllamaMockedTestCase):
     def test_no_notes_dir(self) -> None:
         with mock.patch.dict(os.environ, {}, clear=True):
             os.environ.pop("TARS_NOTES_DIR", None)
@@ -282,7 +281,7 @@ class BuildNotesIndexTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             d = Path(td)
             (d / "note.md").write_text("# My Note\n\nSome content.\n", encoding="utf-8")
-            with mock.patch.dict(os.environ, {"TARS_NOTES_DIR": td}):
+            with set_env(TARS_NOTES_DIR=td):
                 stats = build_notes_index(model="test-model")
             self.assertTrue((d / "notes.db").exists())
             self.assertEqual(stats["indexed"], 1)
@@ -292,7 +291,7 @@ class BuildNotesIndexTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             d = Path(td)
             (d / "note.md").write_text("# Note\n\nContent.\n", encoding="utf-8")
-            with mock.patch.dict(os.environ, {"TARS_NOTES_DIR": td}):
+            with set_env(TARS_NOTES_DIR=td):
                 build_notes_index(model="test-model")
             import sqlite3
             conn = sqlite3.connect(str(d / "notes.db"))
@@ -305,7 +304,7 @@ class BuildNotesIndexTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             d = Path(td)
             (d / "note.md").write_text("# Note\n\nFacts.\n", encoding="utf-8")
-            with mock.patch.dict(os.environ, {"TARS_NOTES_DIR": td}):
+            with set_env(TARS_NOTES_DIR=td):
                 stats1 = build_notes_index(model="test-model")
                 stats2 = build_notes_index(model="test-model")
             self.assertEqual(stats1["indexed"], 1)
@@ -313,21 +312,17 @@ class BuildNotesIndexTests(unittest.TestCase):
             self.assertEqual(stats2["skipped"], 1)
 
 
-class ContextInEmbeddingTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self._patcher = mock.patch.object(embeddings, "ollama")
-        self._mock_ollama = self._patcher.start()
-        self._mock_ollama.embed.side_effect = _fake_embed
-
-    def tearDown(self) -> None:
-        self._patcher.stop()
-
+class ContextInEmbeddingTests(_OllamaMockedTestCase):
     def test_heading_context_prepended_in_embed_input(self) -> None:
-        content = "# Recipes\n\n## Main Dishes\n\n" + ("Pasta with sauce and garlic bread.\n" * 200)
+        content = "# Recipes\n\n## Main Dishes\n\nPasta with sauce.\n\nGarlic bread.\n\nSide salad.\n"
+        # A tiny chunk target splits this into two chunks, so the second
+        # one starts under the headings and carries their context.
+        small_chunks = functools.partial(chunk_markdown, target_tokens=8)
         with tempfile.TemporaryDirectory() as td:
             d = Path(td)
             (d / "Memory.md").write_text(content, encoding="utf-8")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td), \
+                 mock.patch("tars.indexer.chunk_markdown", small_chunks):
                 with mock.patch("tars.indexer.embed", side_effect=lambda texts, **kw: [[0.1] * _DIM for _ in texts]) as mock_embed:
                     build_index(model="test-model")
             self.assertTrue(mock_embed.called)
@@ -406,19 +401,12 @@ class BatchedEmbedTests(unittest.TestCase):
 
     def test_count_mismatch_raises(self) -> None:
         with mock.patch("tars.indexer.embed", return_value=[[0.1] * _DIM]):
-            with self.assertRaises(ValueError):
-                _batched_embed(["a", "b"], model="test")
-
-
-class SavepointAtomicityTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self._patcher = mock.patch.object(embeddings, "ollama")
-        self._mock_ollama = self._patcher.start()
-        self._mock_ollama.embed.side_effect = _fake_embed
+            with mock.patch("tars.indexer.time.sleep"):
+                with self.assertRaises(ValueError):
+                    _batched_embed(["a", "b"], model="test")
 
-    def tearDown(self) -> None:
-        self._patcher.stop()
 
+class SavepointAtomicityTests(_OllamaMockedTestCase):
     def test_embed_failure_preserves_old_chunks(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             d = Path(td)
@@ -426,7 +414,7 @@ class SavepointAtomicityTests(unittest.TestCase):
                 "# Memory\n\nOriginal content here.\n", encoding="utf-8"
             )
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats1 = build_index(model="test-model")
                 self.assertEqual(stats1["indexed"], 1)
 
@@ -436,7 +424,8 @@ class SavepointAtomicityTests(unittest.TestCase):
 
                 # Fail embedding — _index_files catches per-file
                 with mock.patch("tars.indexer.embed", side_effect=RuntimeError("embed service down")):
-                    stats2 = build_index(model="test-model")
+                    with mock.patch("tars.indexer.time.sleep"):
+                        stats2 = build_index(model="test-model")
                 self.assertEqual(stats2["indexed"], 0)
 
                 # Restore embed and retry — file should be reindexable (content_hash reset)
@@ -459,23 +448,16 @@ class SavepointAtomicityTests(unittest.TestCase):
                     raise RuntimeError("boom")
                 return [[0.1] * _DIM for _ in texts]
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 with mock.patch("tars.indexer.embed", side_effect=fail_for_bad):
-                    stats = build_index(model="test-model")
+                    with mock.patch("tars.indexer.time.sleep"):
+                        stats = build_index(model="test-model")
 
             self.assertEqual(stats["indexed"], 1)
 
 
 @unittest.skipUnless(_HAS_SQLITE_VEC, "sqlite-vec not installed")
-class ZeroChunkCleanupTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self._patcher = mock.patch.object(embeddings, "ollama")
-        self._mock_ollama = self._patcher.start()
-        self._mock_ollama.embed.side_effect = _fake_embed
-
-    def tearDown(self) -> None:
-        self._patcher.stop()
-
+class ZeroChunkCleanupTests(_OllamaMockedTestCase):
     def test_emptied_file_cleans_stale_chunks(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             d = Path(td)
@@ -483,7 +465,7 @@ class ZeroChunkCleanupTests(unittest.TestCase):
                 "# Memory\n\nSome real content here.\n", encoding="utf-8"
             )
 
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": td}):
+            with set_env(TARS_MEMORY_DIR=td):
                 stats1 = build_index(model="test-model")
                 self.assertEqual(stats1["indexed"], 1)
                 self.assertGreater(stats1["chunks"], 0)
@@ -0,0 +1,55 @@
+import importlib.machinery
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Other test modules stub sys.modules["anthropic"] and ["openai"] in this
+# process, so these checks run a fresh interpreter against the installed SDKs.
+_HAS_SDKS = all(
+    importlib.machinery.PathFinder.find_spec(name) is not None
+    for name in ("anthropic", "openai")
+)
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _run(script: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=_REPO_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out)
+
+
+@unittest.skipUnless(_HAS_SDKS, "anthropic and openai SDKs not installed")
+class LazySDKImportTests(unittest.TestCase):
+    def test_cli_import_does_not_load_sdks(self) -> None:
+        state = _run(
+            "import json, sys\n"
+            "import tars.cli\n"
+            "print(json.dumps({\n"
+            "    name: any(m.startswith(name + '.') for m in sys.modules)\n"
+            "    for name in ('anthropic', 'openai')\n"
+            "}))\n"
+        )
+        self.assertEqual(state, {"anthropic": False, "openai": False})
+
+    def test_provider_errors_resolve_real_classes(self) -> None:
+        state = _run(
+            "import json\n"
+            "from tars import conversation\n"
+            "errors = conversation._provider_errors()\n"
+            "import anthropic, openai\n"
+            "print(json.dumps({\n"
+            "    'expected': [anthropic.APIStatusError in errors, anthropic.APIConnectionError in errors,\n"
+            "                 anthropic.APITimeoutError in errors, openai.APIStatusError in errors,\n"
+            "                 openai.APIConnectionError in errors, openai.APITimeoutError in errors],\n"
+            "    'count': len(errors),\n"
+            "}))\n"
+        )
+        self.assertEqual(state, {"expected": [True] * 6, "count": 6})
+
+
+if __name__ == "__main__":
+    unittest.main()
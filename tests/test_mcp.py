@@ -1,36 +1,44 @@
 """Tests for MCP client integration."""
 
+import asyncio
 import json
 import os
-import sys
 import tempfile
 import threading
 import unittest
 from pathlib import Path
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
+
+from mcp.types import CallToolResult, TextContent
+
+from tars import tools
+from tars.commands import command_names, dispatch
+from tars.mcp import MCPClient, ServerInfo, _load_mcp_config, _validate_config
+from tars.router import _TOOL_NAMES, update_tool_names
+from tars.tools import ANTHROPIC_TOOLS, get_all_tools, get_mcp_client, set_mcp_client
 
 
 class ConfigTests(unittest.TestCase):
     """Test MCP config loading and validation."""
 
-    def test_load_from_json_file(self) -> None:
-        from tars.mcp import _load_mcp_config
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        # Every file-based test rewrites mcp_servers.json, so one directory
+        # serves the whole class.
+        cls.tmpdir = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        cls.config_path = cls.tmpdir / "mcp_servers.json"
 
+    def test_load_from_json_file(self) -> None:
         config = {"fetch": {"command": "uvx", "args": ["mcp-server-fetch"]}}
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "mcp_servers.json"
-            config_path.write_text(json.dumps(config))
-            with mock.patch("tars.mcp._memory_dir", return_value=Path(tmpdir)):
-                result = _load_mcp_config()
+        self.config_path.write_text(json.dumps(config))
+        with mock.patch("tars.mcp._memory_dir", return_value=self.tmpdir):
+            result = _load_mcp_config()
         self.assertEqual(result, config)
 
     def test_load_from_env_var(self) -> None:
-        from tars.mcp import _load_mcp_config
-
         config = {"github": {"command": "npx", "args": ["-y", "server-github"]}}
         with mock.patch("tars.mcp._memory_dir", return_value=None):
             with mock.patch.dict(os.environ, {"TARS_MCP_SERVERS": json.dumps(config)}):
@@ -38,21 +46,15 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual(result, config)
 
     def test_file_takes_precedence_over_env(self) -> None:
-        from tars.mcp import _load_mcp_config
-
         file_config = {"fetch": {"command": "uvx", "args": ["mcp-server-fetch"]}}
         env_config = {"github": {"command": "npx", "args": ["-y", "server-github"]}}
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "mcp_servers.json"
-            config_path.write_text(json.dumps(file_config))
-            with mock.patch("tars.mcp._memory_dir", return_value=Path(tmpdir)):
-                with mock.patch.dict(os.environ, {"TARS_MCP_SERVERS": json.dumps(env_config)}):
-                    result = _load_mcp_config()
+        self.config_path.write_text(json.dumps(file_config))
+        with mock.patch("tars.mcp._memory_dir", return_value=self.tmpdir):
+            with mock.patch.dict(os.environ, {"TARS_MCP_SERVERS": json.dumps(env_config)}):
+                result = _load_mcp_config()
         self.assertEqual(result, file_config)
 
     def test_empty_config(self) -> None:
-        from tars.mcp import _load_mcp_config
-
         with mock.patch("tars.mcp._memory_dir", return_value=None):
             with mock.patch.dict(os.environ, {}, clear=False):
                 os.environ.pop("TARS_MCP_SERVERS", None)
@@ -60,39 +62,27 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual(result, {})
 
     def test_invalid_json(self) -> None:
-        from tars.mcp import _load_mcp_config
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_path = Path(tmpdir) / "mcp_servers.json"
-            config_path.write_text("not valid json{{{")
-            with mock.patch("tars.mcp._memory_dir", return_value=Path(tmpdir)):
-                result = _load_mcp_config()
+        self.config_path.write_text("not valid json{{{")
+        with mock.patch("tars.mcp._memory_dir", return_value=self.tmpdir):
+            result = _load_mcp_config()
         self.assertEqual(result, {})
 
     def test_missing_command_field(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {"bad": {"args": ["something"]}}
         result = _validate_config(config)
         self.assertEqual(result, {})
 
     def test_args_not_a_list(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {"bad": {"command": "uvx", "args": "not-a-list"}}
         result = _validate_config(config)
         self.assertEqual(result, {})
 
     def test_entry_not_a_dict(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {"bad": "just a string"}
         result = _validate_config(config)
         self.assertEqual(result, {})
 
     def test_valid_with_env(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {
             "fetch": {"command": "uvx", "args": ["mcp-server-fetch"]},
             "github": {
@@ -105,8 +95,6 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual(result, config)
 
     def test_mixed_valid_invalid(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {
             "good": {"command": "uvx", "args": []},
             "bad_no_command": {"args": ["x"]},
@@ -121,9 +109,6 @@ class RunAsyncTests(unittest.TestCase):
     """Test MCPClient._run_async timeout cancellation."""
 
     def test_cancels_future_on_timeout(self) -> None:
-        import asyncio
-        from tars.mcp import MCPClient
-
         client = MCPClient({})
         client._loop = asyncio.new_event_loop()
         thread = threading.Thread(target=client._loop.run_forever, daemon=True)
@@ -145,15 +130,11 @@ class ValidationDotsTests(unittest.TestCase):
     """Test that dots in server names are rejected."""
 
     def test_rejects_dots_in_name(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {"my.server": {"command": "uvx", "args": []}}
         result = _validate_config(config)
         self.assertEqual(result, {})
 
     def test_valid_name_without_dots(self) -> None:
-        from tars.mcp import _validate_config
-
         config = {"myserver": {"command": "uvx", "args": []}}
         result = _validate_config(config)
         self.assertEqual(len(result), 1)
@@ -165,8 +146,6 @@ class ToolDiscoveryTests(unittest.TestCase):
 
     def _make_client_with_tools(self, server_name, tools):
         """Create an MCPClient with pre-populated server info (no real connection)."""
-        from tars.mcp import MCPClient, ServerInfo
-
         client = MCPClient({})
         client._servers[server_name] = ServerInfo(
             name=server_name,
@@ -207,13 +186,10 @@ class ToolDiscoveryTests(unittest.TestCase):
         self.assertEqual(names, ["gh.create_issue", "gh.list_repos"])
 
     def test_discover_empty_when_no_servers(self) -> None:
-        from tars.mcp import MCPClient
         client = MCPClient({})
         self.assertEqual(client.discover_tools(), [])
 
     def test_merge_with_native_tools(self) -> None:
-        from tars.tools import ANTHROPIC_TOOLS, get_all_tools
-
         tools = [
             {"name": "fetch.fetch_url", "description": "Fetch",
              "input_schema": {}, "_server": "fetch", "_tool_name": "fetch_url"},
@@ -234,8 +210,6 @@ class ToolCallTests(unittest.TestCase):
 
     def _make_client_with_session(self, server_name):
         """Create an MCPClient with a mock session and a fake event loop."""
-        from tars.mcp import MCPClient, ServerInfo
-
         client = MCPClient({})
         mock_session = mock.Mock()
         client._sessions[server_name] = mock_session
@@ -250,8 +224,6 @@ class ToolCallTests(unittest.TestCase):
         return client, mock_session
 
     def test_call_tool_routes_to_correct_server(self) -> None:
-        from mcp.types import CallToolResult, TextContent
-
         client, mock_session = self._make_client_with_session("fetch")
         result_obj = CallToolResult(
             content=[TextContent(type="text", text="page content")],
@@ -263,8 +235,6 @@ class ToolCallTests(unittest.TestCase):
         self.assertEqual(result, "page content")
 
     def test_call_tool_strips_prefix(self) -> None:
-        from mcp.types import CallToolResult, TextContent
-
         client, mock_session = self._make_client_with_session("gh")
         result_obj = CallToolResult(
             content=[TextContent(type="text", text="issue created")],
@@ -277,7 +247,6 @@ class ToolCallTests(unittest.TestCase):
         mock_session.call_tool.assert_called_once_with("create_issue", {"title": "test"})
 
     def test_call_tool_server_not_connected(self) -> None:
-        from tars.mcp import MCPClient
         client = MCPClient({})
         result = client.call_tool("unknown.tool", {})
         parsed = json.loads(result)
@@ -285,8 +254,6 @@ class ToolCallTests(unittest.TestCase):
         self.assertIn("not connected", parsed["error"])
 
     def test_call_tool_error_response(self) -> None:
-        from mcp.types import CallToolResult, TextContent
-
         client, _ = self._make_client_with_session("fetch")
         result_obj = CallToolResult(
             content=[TextContent(type="text", text="404 not found")],
@@ -307,7 +274,6 @@ class ToolCallTests(unittest.TestCase):
         self.assertIn("connection lost", parsed["error"])
 
     def test_call_tool_invalid_name_no_dot(self) -> None:
-        from tars.mcp import MCPClient
         client = MCPClient({})
         result = client.call_tool("nodot", {})
         parsed = json.loads(result)
@@ -319,57 +285,47 @@ class DispatchTests(unittest.TestCase):
     """Test that run_tool routes MCP tools correctly."""
 
     def test_mcp_tool_dispatched(self) -> None:
-        from tars import tools
         mock_client = mock.Mock()
         mock_client.call_tool.return_value = '{"result": "ok"}'
-        original = tools._mcp_client
-        try:
-            tools._mcp_client = mock_client
-            result = tools.run_tool("fetch.fetch_url", {"url": "https://example.com"}, quiet=True)
-            mock_client.call_tool.assert_called_once_with(
-                "fetch.fetch_url", {"url": "https://example.com"}
-            )
-            self.assertEqual(result, '{"result": "ok"}')
-        finally:
-            tools._mcp_client = original
+        result = tools.run_tool(
+            "fetch.fetch_url", {"url": "https://example.com"}, quiet=True, mcp_client=mock_client,
+        )
+        mock_client.call_tool.assert_called_once_with(
+            "fetch.fetch_url", {"url": "https://example.com"}
+        )
+        self.assertEqual(result, '{"result": "ok"}')
 
     def test_native_tools_still_work_with_mcp_client(self) -> None:
-        from tars import tools
         mock_client = mock.Mock()
-        original = tools._mcp_client
-        try:
-            tools._mcp_client = mock_client
-            with mock.patch("tars.tools._run_weather_tool", return_value='{"temp": 20}'):
-                result = tools.run_tool("weather_now", {}, quiet=True)
-            self.assertEqual(result, '{"temp": 20}')
-            mock_client.call_tool.assert_not_called()
-        finally:
-            tools._mcp_client = original
+        with mock.patch("tars.tools._run_weather_tool", return_value='{"temp": 20}'):
+            result = tools.run_tool("weather_now", {}, quiet=True, mcp_client=mock_client)
+        self.assertEqual(result, '{"temp": 20}')
+        mock_client.call_tool.assert_not_called()
+
+    def test_falls_back_to_registered_client(self) -> None:
+        mock_client = mock.Mock()
+        mock_client.call_tool.return_value = '{"result": "ok"}'
+        with mock.patch.object(tools, "_mcp_client", mock_client):
+            result = tools.run_tool("fetch.fetch_url", {}, quiet=True)
+        self.assertEqual(result, '{"result": "ok"}')
 
     def test_unknown_tool_without_mcp(self) -> None:
-        from tars import tools
-        original = tools._mcp_client
-        try:
-            tools._mcp_client = None
+        with mock.patch.object(tools, "_mcp_client", None):
             result = tools.run_tool("nonexistent.tool", {}, quiet=True)
-            parsed = json.loads(result)
-            self.assertIn("error", parsed)
-            self.assertIn("Unknown tool", parsed["error"])
-        finally:
-            tools._mcp_client = original
+        parsed = json.loads(result)
+        self.assertIn("error", parsed)
+        self.assertIn("Unknown tool", parsed["error"])
 
 
 class CommandTests(unittest.TestCase):
     """Test /mcp command dispatch."""
 
     def test_mcp_no_client(self) -> None:
-        from tars.commands import dispatch
         with mock.patch("tars.tools.get_mcp_client", return_value=None):
             result = dispatch("/mcp")
         self.assertIn("no MCP servers configured", result)
 
     def test_mcp_no_servers(self) -> None:
-        from tars.commands import dispatch
         mock_client = mock.Mock()
         mock_client.list_servers.return_value = []
         with mock.patch("tars.tools.get_mcp_client", return_value=mock_client):
@@ -377,7 +333,6 @@ class CommandTests(unittest.TestCase):
         self.assertIn("no MCP servers connected", result)
 
     def test_mcp_lists_servers(self) -> None:
-        from tars.commands import dispatch
         mock_client = mock.Mock()
         mock_client.list_servers.return_value = [
             {"name": "fetch", "status": "connected", "tool_count": 2,
@@ -392,7 +347,6 @@ class CommandTests(unittest.TestCase):
         self.assertIn("github (3 tools)", result)
 
     def test_mcp_shows_error_status(self) -> None:
-        from tars.commands import dispatch
         mock_client = mock.Mock()
         mock_client.list_servers.return_value = [
             {"name": "broken", "status": "error: connection refused",
@@ -404,7 +358,6 @@ class CommandTests(unittest.TestCase):
         self.assertIn("error: connection refused", result)
 
     def test_mcp_in_command_names(self) -> None:
-        from tars.commands import command_names
         self.assertIn("/mcp", command_names())
 
 
@@ -412,7 +365,6 @@ class ClientAccessorTests(unittest.TestCase):
     """Test get/set MCP client functions."""
 
     def test_set_and_get(self) -> None:
-        from tars.tools import get_mcp_client, set_mcp_client
         original = get_mcp_client()
         try:
             sentinel = mock.Mock()
@@ -428,8 +380,6 @@ class ListServersTests(unittest.TestCase):
     """Test MCPClient.list_servers()."""
 
     def test_list_servers_info(self) -> None:
-        from tars.mcp import MCPClient, ServerInfo
-
         client = MCPClient({})
         client._servers["fetch"] = ServerInfo(
             name="fetch",
@@ -453,8 +403,6 @@ class RouterIntegrationTests(unittest.TestCase):
     """Test that MCP tool names integrate with the router."""
 
     def test_update_tool_names(self) -> None:
-        from tars.router import _TOOL_NAMES, update_tool_names
-
         original_size = len(_TOOL_NAMES)
         update_tool_names({"fetch.fetch_url", "github.create_issue"})
         self.assertIn("fetch.fetch_url", _TOOL_NAMES)
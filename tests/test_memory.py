@@ -1,28 +1,25 @@
 import json
 import os
-import sys
 import tempfile
 import unittest
 from datetime import datetime
 from unittest import mock
 from pathlib import Path
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 from tars import memory, core, tools
 
 
 class MemoryToolTests(unittest.TestCase):
     def test_memory_recall_requires_config(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             result = json.loads(memory._run_memory_tool("memory_recall", {}))
         self.assertIn("Memory not configured", result.get("error", ""))
 
     def test_memory_recall_no_files(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(memory._run_memory_tool("memory_recall", {}))
         self.assertIn("No memory files found", result.get("error", ""))
 
@@ -31,7 +28,7 @@ class MemoryToolTests(unittest.TestCase):
             memory_path = os.path.join(tmpdir, "Memory.md")
             with open(memory_path, "w", encoding="utf-8") as handle:
                 handle.write("- something else\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool(
                         "memory_update",
@@ -42,7 +39,7 @@ class MemoryToolTests(unittest.TestCase):
 
     def test_memory_remember_invalid_section(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool(
                         "memory_remember",
@@ -85,12 +82,27 @@ class MemoryToolTests(unittest.TestCase):
         self.assertIn("- existing", updated)
         self.assertIn("- new item", updated)
 
+    def test_append_to_file_matches_rewrite_output(self) -> None:
+        cases = {
+            "- existing\n": "- existing\n- new item\n",
+            "- existing": "- existing\n- new item\n",
+            "- existing\n\n\n": "- existing\n- new item\n",
+            "": "\n- new item\n",
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "Memory.md"
+            for before, after in cases.items():
+                with self.subTest(before=before):
+                    path.write_text(before, encoding="utf-8")
+                    memory._append_to_file(path, "new item")
+                    self.assertEqual(path.read_text(encoding="utf-8"), after)
+
     def test_memory_forget_removes_entry(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             memory_path = os.path.join(tmpdir, "Memory.md")
             with open(memory_path, "w", encoding="utf-8") as handle:
                 handle.write("- keep this\n- forget this\n- also keep\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_forget", {"content": "forget this"})
                 )
@@ -106,14 +118,14 @@ class MemoryToolTests(unittest.TestCase):
             memory_path = os.path.join(tmpdir, "Memory.md")
             with open(memory_path, "w", encoding="utf-8") as handle:
                 handle.write("- something else\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_forget", {"content": "not here"})
                 )
             self.assertIn("Could not find entry", result.get("error", ""))
 
     def test_memory_forget_no_config(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             result = json.loads(
                 memory._run_memory_tool("memory_forget", {"content": "anything"})
             )
@@ -121,7 +133,7 @@ class MemoryToolTests(unittest.TestCase):
 
     def test_save_correction_creates_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = memory.save_correction("hello", "wrong answer")
             text = (Path(tmpdir) / "corrections.md").read_text()
         self.assertEqual(result, "feedback saved")
@@ -133,7 +145,7 @@ class MemoryToolTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             path = Path(tmpdir) / "corrections.md"
             path.write_text("# Corrections\n\n## 2026-01-01T00:00:00\n- input: old\n- got: old reply\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 memory.save_correction("new q", "new reply")
             text = path.read_text()
             self.assertIn("- input: old", text)
@@ -141,19 +153,19 @@ class MemoryToolTests(unittest.TestCase):
 
     def test_save_correction_with_note(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 memory.save_correction("q", "a", "should have used todoist")
             text = (Path(tmpdir) / "corrections.md").read_text()
             self.assertIn("- note: should have used todoist", text)
 
     def test_save_correction_no_memory_dir(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             result = memory.save_correction("q", "a")
         self.assertEqual(result, "no memory dir configured")
 
     def test_save_reward_creates_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = memory.save_reward("hello", "great answer")
             text = (Path(tmpdir) / "rewards.md").read_text()
         self.assertEqual(result, "feedback saved")
@@ -163,7 +175,7 @@ class MemoryToolTests(unittest.TestCase):
 
     def test_save_reward_with_note(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 memory.save_reward("q", "a", "nailed the todoist routing")
             text = (Path(tmpdir) / "rewards.md").read_text()
         self.assertIn("- note: nailed the todoist routing", text)
@@ -172,20 +184,20 @@ class MemoryToolTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "corrections.md").write_text("# Corrections\n## entry\n")
             (Path(tmpdir) / "rewards.md").write_text("# Rewards\n## entry\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 corrections, rewards = memory.load_feedback()
         self.assertIn("# Corrections", corrections)
         self.assertIn("# Rewards", rewards)
 
     def test_load_feedback_empty(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 corrections, rewards = memory.load_feedback()
         self.assertEqual(corrections, "")
         self.assertEqual(rewards, "")
 
     def test_load_feedback_no_memory_dir(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             corrections, rewards = memory.load_feedback()
         self.assertEqual(corrections, "")
         self.assertEqual(rewards, "")
@@ -194,7 +206,7 @@ class MemoryToolTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "corrections.md").write_text("data")
             (Path(tmpdir) / "rewards.md").write_text("data")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 memory.archive_feedback()
             # Originals should be gone
             self.assertFalse((Path(tmpdir) / "corrections.md").exists())
@@ -207,7 +219,7 @@ class MemoryToolTests(unittest.TestCase):
 
     def test_archive_feedback_no_files(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 # Should not raise
                 memory.archive_feedback()
 
@@ -215,7 +227,7 @@ class MemoryToolTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             p = Path(tmpdir) / "Memory.md"
             p.write_text("# Memory\n- existing fact\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_remember", {"section": "semantic", "content": "existing fact"})
                 )
@@ -229,7 +241,7 @@ class MemoryToolTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             p = Path(tmpdir) / "Memory.md"
             p.write_text("# Memory\n- old fact\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_remember", {"section": "semantic", "content": "new fact"})
                 )
@@ -242,13 +254,13 @@ class MemoryToolTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "Memory.md").write_text("semantic data")
             (Path(tmpdir) / "Procedural.md").write_text("procedural data")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 files = memory.load_memory_files()
         self.assertEqual(files["semantic"], "semantic data")
         self.assertEqual(files["procedural"], "procedural data")
 
     def test_load_memory_files_empty(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             files = memory.load_memory_files()
         self.assertEqual(files, {})
 
@@ -267,24 +279,24 @@ class PinnedMemoryTests(unittest.TestCase):
     def test_load_pinned_returns_content(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "Pinned.md").write_text("- watching Severance S2\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 content = memory._load_pinned()
         self.assertIn("watching Severance S2", content)
 
     def test_load_pinned_returns_empty_when_missing(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 content = memory._load_pinned()
         self.assertEqual(content, "")
 
     def test_load_pinned_no_memory_dir(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             content = memory._load_pinned()
         self.assertEqual(content, "")
 
     def test_memory_remember_pinned_section(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool(
                         "memory_remember",
@@ -298,7 +310,7 @@ class PinnedMemoryTests(unittest.TestCase):
     def test_memory_forget_pinned_entry(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "Pinned.md").write_text("- item to remove\n- keep this\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_forget", {"content": "item to remove"})
                 )
@@ -310,7 +322,7 @@ class PinnedMemoryTests(unittest.TestCase):
     def test_memory_forget_invalid_section_returns_error(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "Pinned.md").write_text("- item\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_forget", {"content": "item", "section": "pinnd"})
                 )
@@ -322,7 +334,7 @@ class PinnedMemoryTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "Memory.md").write_text("- shared text\n- semantic only\n")
             (Path(tmpdir) / "Pinned.md").write_text("- shared text\n- pinned only\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(
                     memory._run_memory_tool("memory_forget", {"content": "shared text", "section": "pinned"})
                 )
@@ -336,7 +348,7 @@ class PinnedMemoryTests(unittest.TestCase):
     def test_memory_recall_includes_pinned(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             (Path(tmpdir) / "Pinned.md").write_text("- pinned item\n")
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 result = json.loads(memory._run_memory_tool("memory_recall", {}))
         self.assertIn("pinned", result)
         self.assertIn("pinned item", result["pinned"])
@@ -345,7 +357,7 @@ class PinnedMemoryTests(unittest.TestCase):
 class DailyMemoryTests(unittest.TestCase):
     def test_daily_memory_path_returns_today(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 p = memory.daily_memory_path()
         today = datetime.now().strftime("%Y-%m-%d")
         self.assertIsNotNone(p)
@@ -353,19 +365,19 @@ class DailyMemoryTests(unittest.TestCase):
 
     def test_daily_memory_path_specific_date(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 d = datetime(2026, 1, 15, 10, 30)
                 p = memory.daily_memory_path(d)
         self.assertEqual(p.name, "2026-01-15.md")
 
     def test_daily_memory_path_no_memory_dir(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             p = memory.daily_memory_path()
         self.assertIsNone(p)
 
     def test_append_daily_creates_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 d = datetime(2026, 3, 1, 14, 30)
                 memory.append_daily("tool:weather_now — sunny", date=d)
             text = (Path(tmpdir) / "2026-03-01.md").read_text()
@@ -374,7 +386,7 @@ class DailyMemoryTests(unittest.TestCase):
 
     def test_append_daily_appends(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 d1 = datetime(2026, 3, 1, 9, 0)
                 d2 = datetime(2026, 3, 1, 10, 15)
                 memory.append_daily("first entry", date=d1)
@@ -385,13 +397,13 @@ class DailyMemoryTests(unittest.TestCase):
         self.assertEqual(text.count("# 2026-03-01"), 1)
 
     def test_append_daily_no_memory_dir(self) -> None:
-        with mock.patch.dict(os.environ, {}, clear=True):
+        with mock.patch.object(os, "environ", {}):
             # Should not raise
             memory.append_daily("ignored entry")
 
     def test_load_daily_today(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 d = datetime(2026, 3, 1, 14, 30)
                 memory.append_daily("test entry", date=d)
                 content = memory.load_daily(date=d)
@@ -399,13 +411,13 @@ class DailyMemoryTests(unittest.TestCase):
 
     def test_load_daily_missing(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 content = memory.load_daily(date=datetime(2099, 1, 1))
         self.assertEqual(content, "")
 
     def test_load_daily_specific_date(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
-            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+            with mock.patch.object(os, "environ", {"TARS_MEMORY_DIR": tmpdir}):
                 d = datetime(2026, 2, 14, 8, 0)
                 memory.append_daily("valentine", date=d)
                 content = memory.load_daily(date=d)
@@ -1,12 +1,9 @@
-import sys
 import unittest
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
-_mock_ollama = mock.MagicMock()
-sys.modules.setdefault("ollama", _mock_ollama)
+_mock_ollama = mock.Mock()
 
 from tars import rewriter
 
@@ -1,7 +1,14 @@
+import re
 import unittest
 
 from tars.config import ModelConfig
-from tars.router import RouteResult, route_message
+from tars.router import (
+    _ANY_HINT_RE,
+    _COMPILED_HINT_PATTERNS,
+    RouteResult,
+    _any_hint_re,
+    route_message,
+)
 
 
 _ESC_CONFIG = ModelConfig(
@@ -243,5 +250,30 @@ class TestRouter(unittest.TestCase):
         self.assertIn("note_append", result.tool_hints)
 
 
+class TestHintPrefilter(unittest.TestCase):
+    def test_agrees_with_individual_patterns(self):
+        messages = [
+            "hey, how was your day?",
+            "read https://example.com/post",
+            "Note: call the plumber",
+            "what's the WEATHER like",
+            "show my favourite segments",
+            "zone 2 training this week",
+            "these API routes are slow",
+        ]
+        for text in messages:
+            with self.subTest(text=text):
+                any_single = any(pat.search(text) for pat, _ in _COMPILED_HINT_PATTERNS)
+                self.assertEqual(bool(_ANY_HINT_RE.search(text)), any_single)
+
+    def test_top_level_alternation_keeps_its_own_boundary(self):
+        patterns = [r"\bfoo|bar", r"\b(?:baz|qux)\b", r"[|]pipe"]
+        combined = _any_hint_re(patterns)
+        for text in ["xbar", "foo", "xfoo", "a baz", "xqux", "|pipe", "pipe"]:
+            with self.subTest(text=text):
+                any_single = any(re.search(p, text, re.IGNORECASE) for p in patterns)
+                self.assertEqual(bool(combined.search(text)), any_single)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,10 @@
 import json
 import os
-import sys
 import tempfile
 import unittest
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
-sys.modules.setdefault("ollama", mock.MagicMock())
+import tests._stubs  # noqa: F401
 
 try:
     import sqlite_vec
@@ -891,6 +888,17 @@ class SearchExpandedTests(unittest.TestCase):
                 mock_hy.assert_called_once_with("Perry the dog")
                 self.assertGreater(len(results), 0)
 
+    def test_expanded_queries_embedded_in_one_call(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
+                conn, *_ = _setup_db_with_chunks(tmpdir)
+                conn.close()
+                self._patch_rewriter(["Perry dog", "dog named Perry", "Perry"], None)
+                search_expanded("Perry dog", model="test-model", limit=5)
+                self._mock_ollama.embed.assert_called_once()
+                _, kwargs = self._mock_ollama.embed.call_args
+                self.assertEqual(len(kwargs["input"]), 3)
+
     def test_without_hyde_short_query(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             with mock.patch.dict(os.environ, {"TARS_MEMORY_DIR": tmpdir}, clear=True):
@@ -1,12 +1,9 @@
 """Tests for the shared services startup/teardown module."""
 
-import sys
 import unittest
 from unittest import mock
 
-sys.modules.setdefault("anthropic", mock.Mock())
-sys.modules.setdefault("ollama", mock.Mock())
-sys.modules.setdefault("dotenv", mock.Mock(load_dotenv=lambda: None))
+import tests._stubs  # noqa: F401
 
 
 class StartStopTests(unittest.TestCase):
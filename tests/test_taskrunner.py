@@ -2,7 +2,6 @@
 
 import json
 import os
-import sys
 import tempfile
 import threading
 import time
@@ -11,9 +10,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from unittest import mock
 
-# Mock ollama before importing tars modules
-if "ollama" not in sys.modules:
-    sys.modules["ollama"] = mock.Mock()
+import tests._stubs  # noqa: F401
 
 from tars.taskrunner import (
     ScheduledTask,
@@ -1,13 +1,10 @@
 """Tests for the Telegram channel module."""
 
 import os
-import sys
 import unittest
 from unittest import mock
 
-# Ensure ollama mock is in place before importing tars modules
-if "ollama" not in sys.modules:
-    sys.modules["ollama"] = mock.Mock()
+import tests._stubs  # noqa: F401
 
 from tars.telegram import (
     _KEYBOARD_ALIASES,